@@ -1,42 +1,556 @@
+import os
+import re
+import sys
+import glob
+import gzip
+import fnmatch
+import time
+import hashlib
+import json
+import heapq
+import bisect
+import argparse
+import functools
+import datetime
+import collections
+import multiprocessing
+
+# 역순으로 읽을 때 한 번에 읽는 블록 크기 (메모리 사용량은 이 크기와 가장 긴 한 줄에만 비례함)
+BLOCK_SIZE = 64 * 1024
+
+
+# 이벤트 수준별 심각도
+EVENT_SEVERITY = {
+    'DEBUG': 0,
+    'INFO': 1,
+    'WARN': 2,
+    'WARNING': 2,
+    'ERROR': 3,
+    'CRITICAL': 4,
+    'FATAL': 4,
+}
+# 이 수준 이상의 이벤트는 키워드가 없어도 문제로 봄
+ISSUE_EVENT_SEVERITY = EVENT_SEVERITY['WARNING']
+
+# 메시지 키워드별 패턴과 심각도 (그룹 이름이 곧 키워드)
+ISSUE_PATTERNS = {
+    'explosion': (r'explo(?:sion|sions|ded|de|des)', 5),
+    'leak': (r'leak(?:s|ed|ing|age)?', 4),
+    'failure': (r'fail(?:ure|ures|ed|s|ing)?', 4),
+    'unstable': (r'unstable|instability', 3),
+}
+# 모든 키워드를 하나의 정규식으로 묶어 한 줄을 한 번만 검사함 (match.lastgroup으로 키워드를 구분)
+ISSUE_REGEX = re.compile(
+    r'\b(?:' + '|'.join(f'(?P<{name}>{pattern})' for name, (pattern, _) in ISSUE_PATTERNS.items()) + r')\b',
+    re.IGNORECASE,
+)
+
+LogIssue = collections.namedtuple('LogIssue', ['severity', 'timestamp', 'event', 'message', 'keyword', 'line'])
+
+
+def classify_line(line):
+    # timestamp,event,message 한 줄을 분류하여 문제가 되는 로그면 LogIssue, 아니면 None을 반환함
+    # 메시지에 쉼표가 있을 수 있으므로 앞의 두 열만 나눔
+    columns = line.split(',', 2)
+    if len(columns) != 3:
+        return None
+    timestamp, event, message = columns
+    event_severity = EVENT_SEVERITY.get(event.strip().upper(), 0)
+
+    match = ISSUE_REGEX.search(message)
+    keyword = match.lastgroup if match else None
+    keyword_severity = ISSUE_PATTERNS[keyword][1] if keyword else 0
+
+    if keyword is None and event_severity < ISSUE_EVENT_SEVERITY:
+        return None
+    return LogIssue(max(event_severity, keyword_severity), timestamp, event, message, keyword, line)
+
+
+def extract_major_issues(lines, output_file, top_n=3):
+    # 로그를 한 번만 읽으면서 문제가 되는 줄을 찾는 즉시 output_file에 기록하고,
+    # 심각도가 높은 순(같으면 이른 시각 순)으로 상위 top_n개만 힙에 유지하여 반환함
+    def issues():
+        for line in lines:
+            issue = classify_line(line)
+            if issue is not None:
+                output_file.write(line + '\n')
+                yield issue
+
+    return heapq.nsmallest(top_n, issues(), key=lambda issue: (-issue.severity, issue.timestamp))
+
+
+def read_header(log_file):
+    # 첫 번째 줄(헤더)을 읽고, 헤더 다음 줄이 시작하는 바이트 위치를 함께 반환함
+    log_file.seek(0)
+    header = log_file.readline()
+    return header.rstrip(b'\r\n').decode('utf-8'), log_file.tell()
+
+
+def iter_lines_reversed(log_file, start_offset=0, block_size=BLOCK_SIZE, end_offset=None):
+    # 파일 끝(end_offset이 주어지면 그 위치)에서부터 block_size 바이트씩 거꾸로 읽으며 한 줄씩 역순으로 돌려줌
+    # start_offset 앞부분(예: 헤더)은 읽지 않음
+    if end_offset is None:
+        end_offset = log_file.seek(0, os.SEEK_END)
+    position = end_offset
+    # 아직 줄바꿈을 만나지 못한 줄의 뒷부분 (블록 경계에 걸친 줄)
+    remainder = b''
+    # 파일 끝의 줄바꿈은 빈 줄로 취급하지 않음
+    skip_trailing_newline = True
+
+    while position > start_offset:
+        read_size = min(block_size, position - start_offset)
+        position -= read_size
+        log_file.seek(position)
+        block = log_file.read(read_size) + remainder
+        if skip_trailing_newline:
+            if block.endswith(b'\n'):
+                block = block[:-1]
+            skip_trailing_newline = False
+
+        lines = block.split(b'\n')
+        # 첫 조각은 앞 블록과 이어질 수 있으므로 남겨 둠
+        remainder = lines[0]
+        for line in reversed(lines[1:]):
+            yield line.rstrip(b'\r').decode('utf-8', errors='replace')
+
+    if remainder:
+        yield remainder.rstrip(b'\r').decode('utf-8', errors='replace')
+
+
+# 희소 시각 색인: 몇 줄마다 한 번 (시각, 바이트 위치)를 기록할지
+INDEX_STRIDE = 1000
+INDEX_VERSION = 2
+# 색인한 로그가 같은 파일인지 확인할 때 해시하는 앞부분과 색인 끝 직전 부분의 크기 (바이트)
+FINGERPRINT_HEAD_SIZE = 4096
+FINGERPRINT_TAIL_SIZE = 256
+
+
+def index_path_for(log_path):
+    # 로그 파일 옆에 두는 색인 파일 경로
+    return log_path + '.idx'
+
+
+def parse_timestamp(text):
+    # 'YYYY-MM-DD HH:MM:SS' 형식의 시각을 datetime으로 변환함 (형식이 다르면 None)
+    try:
+        return datetime.datetime.fromisoformat(text.strip())
+    except ValueError:
+        return None
+
+
+def load_time_index(index_path):
+    # 색인 파일을 읽어 사전으로 반환함 (없거나 깨졌으면 None)
+    try:
+        with open(index_path, 'r', encoding='utf-8') as index_file:
+            index = json.load(index_file)
+    except (OSError, ValueError):
+        return None
+    if index.get('version') != INDEX_VERSION:
+        return None
+    return index
+
+
+def log_fingerprint(log_file, indexed_offset):
+    """
+    색인을 이어 붙여도 되는 같은 로그인지 확인하기 위한 지문.
+    모든 로그의 헤더가 같으므로 헤더 대신 장치/inode 번호와 함께,
+    파일 앞부분과 이미 색인한 위치 직전 부분의 해시를 사용함.
+    (copytruncate 회전처럼 inode가 그대로여도 내용이 바뀌면 다른 지문이 됨)
+    """
+    stat = os.fstat(log_file.fileno())
+    head_length = min(FINGERPRINT_HEAD_SIZE, indexed_offset)
+    tail_start = max(indexed_offset - FINGERPRINT_TAIL_SIZE, 0)
+    log_file.seek(0)
+    head = log_file.read(head_length)
+    log_file.seek(tail_start)
+    tail = log_file.read(indexed_offset - tail_start)
+    return {
+        'dev': stat.st_dev,
+        'ino': stat.st_ino,
+        'head_sha1': hashlib.sha1(head).hexdigest(),
+        'tail_sha1': hashlib.sha1(tail).hexdigest(),
+    }
+
+
+def save_time_index(index, index_path):
+    # 임시 파일에 쓴 뒤 교체하여, 중간에 중단되어도 이전 색인이 남도록 함
+    temp_path = index_path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as index_file:
+        json.dump(index, index_file, ensure_ascii=False)
+    os.replace(temp_path, index_path)
+
+
+def update_time_index(log_path, index_path=None, stride=INDEX_STRIDE):
+    """
+    로그의 stride번째 줄마다 (시각, 바이트 위치)를 색인 파일에 기록함.
+    이미 색인한 위치(indexed_offset) 이후에 추가된 줄만 읽어 색인을 이어 붙이고,
+    로그가 잘리거나 다른 파일로 교체되었으면(지문이 다르면) 처음부터 다시 만듦.
+    """
+    if index_path is None:
+        index_path = index_path_for(log_path)
+
+    with open(log_path, 'rb') as log_file:
+        header, body_offset = read_header(log_file)
+        log_size = os.fstat(log_file.fileno()).st_size
+
+        index = load_time_index(index_path)
+        if (index is None or index['stride'] != stride or index['header'] != header
+                or index['indexed_offset'] > log_size
+                or index['fingerprint'] != log_fingerprint(log_file, index['indexed_offset'])):
+            index = {
+                'version': INDEX_VERSION,
+                'stride': stride,
+                'header': header,
+                'indexed_offset': body_offset,
+                'line_count': 0,
+                'next_mark': 0,
+                'entries': [],
+            }
+        elif index['indexed_offset'] == log_size:
+            return index
+
+        offset = index['indexed_offset']
+        line_count = index['line_count']
+        next_mark = index['next_mark']
+        entries = index['entries']
+
+        log_file.seek(offset)
+        for line in log_file:
+            # 아직 줄바꿈이 오지 않은 마지막 줄은 다음 갱신 때 색인함
+            if not line.endswith(b'\n'):
+                break
+            if line_count >= next_mark:
+                timestamp = parse_timestamp(line.split(b',', 1)[0].decode('utf-8', errors='replace'))
+                # 시각을 읽을 수 없는 줄이면 다음 줄에서 다시 시도함
+                if timestamp is not None:
+                    entries.append([timestamp.isoformat(sep=' '), offset])
+                    next_mark = line_count + stride
+            line_count += 1
+            offset += len(line)
+
+        index['fingerprint'] = log_fingerprint(log_file, offset)
+
+    index['indexed_offset'] = offset
+    index['line_count'] = line_count
+    index['next_mark'] = next_mark
+    save_time_index(index, index_path)
+    return index
+
+
+def query_time_range(log_path, start=None, end=None, index=None):
+    """
+    start <= 시각 <= end 인 줄을 시간 순으로 돌려줌 (로그는 시간 순으로 기록된다고 가정함).
+    색인에서 start 직전 기록 위치로 바로 이동하므로 최대 stride줄만 더 읽고 시작함.
+    """
+    if index is None:
+        index = update_time_index(log_path)
+    with open(log_path, 'rb') as log_file:
+        _, body_offset = read_header(log_file)
+
+        offset = body_offset
+        if start is not None:
+            entry_times = [parse_timestamp(timestamp) for timestamp, _ in index['entries']]
+            position = bisect.bisect_left(entry_times, start)
+            # start보다 이른 마지막 기록부터 읽어야 같은 시각의 앞선 줄을 놓치지 않음
+            if position > 0:
+                offset = index['entries'][position - 1][1]
+
+        log_file.seek(offset)
+        for raw_line in log_file:
+            line = raw_line.rstrip(b'\r\n').decode('utf-8', errors='replace')
+            timestamp = parse_timestamp(line.split(',', 1)[0])
+            if timestamp is None:
+                continue
+            if start is not None and timestamp < start:
+                continue
+            if end is not None and timestamp > end:
+                break
+            yield line
+
+
+# 여러 로그를 집계할 때 큰 파일을 나누는 구간 크기 (바이트)
+AGGREGATE_RANGE_SIZE = 32 * 1024 * 1024
+# 디렉터리가 주어졌을 때 집계할 로그 파일 패턴 (회전된 gzip 로그 포함)
+LOG_FILE_PATTERNS = ('*.log', '*.log.[0-9]*', '*.log.gz', '*.log.*.gz')
+# 문제가 되는 로그를 별도로 저장하는 파일 (이 도구의 출력이므로 집계 대상에서 제외함)
+MAJOR_ISSUES_FILENAME = 'major_issues.log'
+# 디렉터리나 glob으로 찾은 파일 중 집계하지 않을 파일 이름 패턴
+EXCLUDED_LOG_PATTERNS = (MAJOR_ISSUES_FILENAME,)
+
+
+def collect_log_files(paths, exclude=EXCLUDED_LOG_PATTERNS):
+    # 디렉터리, glob 패턴, 파일 경로를 받아 집계할 로그 파일 목록을 중복 없이 반환함
+    # 디렉터리나 glob으로 찾은 파일 중 이름이 exclude 패턴에 맞는 파일은 제외함 (직접 지정한 파일은 그대로 둠)
+    log_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            matched = [name for pattern in LOG_FILE_PATTERNS for name in glob.glob(os.path.join(path, pattern))]
+        elif glob.has_magic(path):
+            matched = glob.glob(path)
+        else:
+            log_files.append(path)
+            continue
+        log_files.extend(sorted(
+            name for name in matched
+            if not any(fnmatch.fnmatch(os.path.basename(name), pattern) for pattern in exclude)
+        ))
+    return list(dict.fromkeys(log_files))
+
+
+def plan_log_ranges(log_files, range_size=AGGREGATE_RANGE_SIZE):
+    # 일반 파일은 range_size 바이트 구간으로 나누고, gzip 파일은 임의 위치로 이동할 수 없으므로 통째로 한 작업으로 둠
+    tasks = []
+    for log_path in log_files:
+        if log_path.endswith('.gz'):
+            tasks.append((log_path, 0, None))
+            continue
+        size = os.path.getsize(log_path)
+        for start in range(0, max(size, 1), range_size):
+            tasks.append((log_path, start, min(start + range_size, size)))
+    return tasks
+
+
+def _iter_range_lines(log_path, start, end):
+    # 줄의 첫 바이트가 [start, end) 안에 있는 줄만 돌려줌 (구간 경계에 걸친 줄은 앞 구간이 읽음)
+    if end is None:
+        with gzip.open(log_path, 'rb') as log_file:
+            yield from log_file
+        return
+
+    with open(log_path, 'rb') as log_file:
+        if start > 0:
+            # start 직전 바이트부터 줄 끝까지 버리면 start 이후 처음 시작하는 줄로 이동함
+            log_file.seek(start - 1)
+            log_file.readline()
+        position = log_file.tell()
+        while position < end:
+            line = log_file.readline()
+            if not line:
+                break
+            position += len(line)
+            yield line
+
+
+def aggregate_log_range(task, top_n=10):
+    """
+    로그 구간 하나를 읽어 줄 대신 작은 부분 집계만 반환함.
+    - levels: 이벤트 수준별 줄 수
+    - minutes: 분('YYYY-MM-DD HH:MM')별 줄 수
+    - issues: 심각도가 높은 순 상위 top_n개 문제 (정렬 키, 파일, 줄)
+    """
+    log_path, start, end = task
+    levels = collections.Counter()
+    minutes = collections.Counter()
+    line_count = 0
+    malformed = 0
+
+    def issues():
+        nonlocal line_count, malformed
+        for raw_line in _iter_range_lines(log_path, start, end):
+            line = raw_line.rstrip(b'\r\n').decode('utf-8', errors='replace')
+            columns = line.split(',', 2)
+            timestamp = parse_timestamp(columns[0]) if len(columns) == 3 else None
+            # 헤더나 형식이 맞지 않는 줄은 집계하지 않음
+            if timestamp is None:
+                if line and line != 'timestamp,event,message':
+                    malformed += 1
+                continue
+            line_count += 1
+            levels[columns[1].strip().upper()] += 1
+            minutes[timestamp.strftime('%Y-%m-%d %H:%M')] += 1
+            issue = classify_line(line)
+            if issue is not None:
+                yield ((-issue.severity, issue.timestamp), log_path, line)
+
+    top_issues = heapq.nsmallest(top_n, issues())
+    return {
+        'lines': line_count,
+        'malformed': malformed,
+        'levels': levels,
+        'minutes': minutes,
+        'issues': top_issues,
+    }
+
+
+def merge_aggregates(partials, top_n=10):
+    # 부분 집계를 합침 (합치는 비용은 입력 크기가 아니라 수준/분/상위 문제 개수에만 비례함)
+    summary = {
+        'lines': 0,
+        'malformed': 0,
+        'levels': collections.Counter(),
+        'minutes': collections.Counter(),
+        'issues': [],
+    }
+    for partial in partials:
+        summary['lines'] += partial['lines']
+        summary['malformed'] += partial['malformed']
+        summary['levels'].update(partial['levels'])
+        summary['minutes'].update(partial['minutes'])
+        summary['issues'] = heapq.nsmallest(top_n, summary['issues'] + partial['issues'])
+    return summary
+
+
+def aggregate_logs(paths, processes=None, range_size=AGGREGATE_RANGE_SIZE, top_n=10,
+                   exclude=EXCLUDED_LOG_PATTERNS):
+    """
+    여러 로그 파일(디렉터리, glob, gzip 포함)을 구간으로 나누어 프로세스 풀에서 집계하고,
+    수준별 개수, 분별 히스토그램, 심각도순 상위 문제를 담은 요약을 반환함.
+    """
+    log_files = collect_log_files(paths, exclude)
+    tasks = plan_log_ranges(log_files, range_size)
+    worker = functools.partial(aggregate_log_range, top_n=top_n)
+
+    if processes == 1 or len(tasks) <= 1:
+        partials = map(worker, tasks)
+        summary = merge_aggregates(partials, top_n)
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            summary = merge_aggregates(pool.imap_unordered(worker, tasks), top_n)
+
+    summary['files'] = log_files
+    summary['tasks'] = len(tasks)
+    summary['minutes'] = dict(sorted(summary['minutes'].items()))
+    summary['levels'] = dict(summary['levels'].most_common())
+    summary['issues'] = [
+        {'severity': -key[0], 'timestamp': key[1], 'file': log_path, 'line': line}
+        for key, log_path, line in summary['issues']
+    ]
+    return summary
+
+
+def print_aggregate_summary(summary):
+    print(f"로그 파일 {len(summary['files'])}개, 작업 구간 {summary['tasks']}개, "
+          f"집계한 줄 {summary['lines']:,}개 (형식 오류 {summary['malformed']:,}개)")
+
+    print('\n이벤트 수준별 개수')
+    for level, count in summary['levels'].items():
+        print(f'  {level:<10} {count:>12,}')
+
+    print('\n분별 로그 수')
+    for minute, count in summary['minutes'].items():
+        print(f'  {minute}  {count:>10,}')
+
+    print(f"\n주요 문제 (심각도순 상위 {len(summary['issues'])}개)")
+    for issue in summary['issues']:
+        print(f"  [심각도 {issue['severity']}] {issue['file']}: {issue['line']}")
+
+
+def follow_lines(log_path, poll_interval=0.5, start_offset=None):
+    # tail -f 처럼 파일에 새로 추가되는 줄을 계속 돌려줌 (Ctrl+C로 종료)
+    # start_offset부터 읽음 (None이면 현재 파일 끝부터, 파일이 그보다 짧아졌으면 처음부터)
+    # 파일이 잘리거나 새 파일로 교체되면 처음부터 다시 읽음
+    log_file = open(log_path, 'rb')
+    try:
+        file_size = log_file.seek(0, os.SEEK_END)
+        if start_offset is not None:
+            log_file.seek(start_offset if start_offset <= file_size else 0)
+        inode = os.fstat(log_file.fileno()).st_ino
+        partial = b''
+        while True:
+            chunk = log_file.readline()
+            if chunk:
+                partial += chunk
+                # 아직 줄바꿈이 오지 않은 줄은 다음 기록을 기다림
+                if partial.endswith(b'\n'):
+                    yield partial.rstrip(b'\r\n').decode('utf-8', errors='replace')
+                    partial = b''
+                continue
+
+            time.sleep(poll_interval)
+            try:
+                stat = os.stat(log_path)
+            except FileNotFoundError:
+                continue
+            if stat.st_ino != inode or stat.st_size < log_file.tell():
+                log_file.close()
+                log_file = open(log_path, 'rb')
+                inode = os.fstat(log_file.fileno()).st_ino
+                partial = b''
+    finally:
+        log_file.close()
+
+
 def main():
+    parser = argparse.ArgumentParser(description='미션 컴퓨터 로그를 시간 역순으로 출력')
     # 로그 파일의 경로를 지정함
-    log_path = 'mission_computer_main.log'
+    parser.add_argument('log_path', nargs='?', default='mission_computer_main.log', help='읽을 로그 파일')
+    parser.add_argument('-f', '--follow', action='store_true', help='출력 후 새로 추가되는 로그를 계속 출력 (tail -f)')
+    parser.add_argument('--block-size', type=int, default=BLOCK_SIZE, help='역순으로 읽을 때 블록 크기(바이트)')
+    parser.add_argument('--top', type=int, default=3, help='심각도순으로 출력할 주요 문제 개수')
+    parser.add_argument('--since', type=parse_timestamp, help="이 시각 이후의 로그만 출력 (예: '2023-08-27 11:30:00')")
+    parser.add_argument('--until', type=parse_timestamp, help='이 시각 이전의 로그만 출력')
+    parser.add_argument('--index-stride', type=int, default=INDEX_STRIDE, help='색인에 기록할 줄 간격')
+    parser.add_argument('--aggregate', nargs='+', metavar='PATH',
+                        help='여러 로그(디렉터리, glob, .gz 포함)를 병렬로 집계하여 요약 보고')
+    parser.add_argument('--processes', type=int, default=None, help='집계에 사용할 프로세스 수 (기본값: CPU 코어 수)')
+    parser.add_argument('--report', help='집계 요약을 저장할 JSON 파일')
+    parser.add_argument('--exclude', action='append', default=None, metavar='PATTERN',
+                        help=f'집계에서 제외할 파일 이름 패턴 (기본값: {", ".join(EXCLUDED_LOG_PATTERNS)})')
+    args = parser.parse_args()
+
+    log_path = args.log_path
     # 문제가 되는 로그를 별도로 저장하기 위한 경로를 지정함
-    output_path = 'major_issues.log'
-    
+    output_path = MAJOR_ISSUES_FILENAME
+
     try:
-        # 로그 파일을 열고 읽음
-        with open(log_path, encoding = 'utf-8') as log_file:
+        # 여러 로그를 병렬로 집계하여 요약 보고
+        if args.aggregate:
+            exclude = EXCLUDED_LOG_PATTERNS if args.exclude is None else tuple(args.exclude)
+            summary = aggregate_logs(args.aggregate, args.processes, top_n=args.top, exclude=exclude)
+            print_aggregate_summary(summary)
+            if args.report:
+                with open(args.report, 'w', encoding = 'utf-8') as report_file:
+                    json.dump(summary, report_file, ensure_ascii=False, indent=2)
+                print(f'\n파일 저장됨: {args.report}')
+            return
+
+        # 시간 범위가 주어지면 색인으로 해당 위치로 바로 이동하여 그 구간만 출력함
+        if args.since is not None or args.until is not None:
+            index = update_time_index(log_path, stride=args.index_stride)
+            print(index['header'])
+            for line in query_time_range(log_path, args.since, args.until, index):
+                print(line)
+            return
+
+        # 로그 파일을 바이너리로 열어 필요한 부분만 읽음 (파일 전체를 메모리에 올리지 않음)
+        with open(log_path, 'rb') as log_file:
             # 로그 파일이 열렸음을 알리는 메시지 출력
             print(f'파일 열림: {log_path}\n')
 
             # 첫 번째 줄은 헤더로 저장
-            header = log_file.readline().rstrip('\n') 
-            # 나머지 줄 리스트에 저장
-            log_lines = []
-            while True:
-                line = log_file.readline()
-                if not line:
-                    break
-                log_lines.append(line.rstrip('\n'))
-            # 상위 3개의 문제가 되는 로그를 추출함
-            major_issues_lines = log_lines[:3]
-            major_issues_content = '\n'.join(major_issues_lines)
-
-            # 로그 내용 시간 역순 출력
-            reversed_log_content = '\n'.join(log_lines[::-1])
+            header, body_offset = read_header(log_file)
 
             print(header) # 헤더 출력
-            print(reversed_log_content) # 시간 역순으로 로그 내용 출력
+            # 지금의 파일 끝까지만 출력하고, -f일 때는 이 위치부터 이어서 읽음 (그 사이에 추가된 줄을 놓치지 않도록)
+            end_offset = log_file.seek(0, os.SEEK_END)
+            # 로그 내용을 블록 단위로 거꾸로 읽으며 시간 역순으로 바로 출력
+            for line in iter_lines_reversed(log_file, body_offset, args.block_size, end_offset):
+                sys.stdout.write(line + '\n')
 
-            # 상위 3개의 문제가 되는 로그를 별도 파일에 저장함
+            # 로그를 처음부터 한 번 더 읽으며 문제가 되는 로그를 별도 파일에 바로 저장함
+            log_file.seek(body_offset)
+            body_lines = (line.rstrip(b'\r\n').decode('utf-8', errors='replace') for line in log_file)
             with open(output_path, 'w', encoding = 'utf-8') as output_file:
-                output_file.write(header + '\n' + major_issues_content)
+                output_file.write(header + '\n')
+                top_issues = extract_major_issues(body_lines, output_file, args.top)
                 print(f"\n파일 저장됨: {output_path}")
-            
-    except FileNotFoundError:
+
+        # 심각도가 높은 순으로 상위 문제 출력
+        print(f'\n주요 문제 (심각도순 상위 {args.top}개)')
+        for issue in top_issues:
+            print(f'[심각도 {issue.severity}] {issue.line}')
+
+        if args.follow:
+            print(f'\n새 로그를 기다리는 중입니다: {log_path} (종료: Ctrl+C)')
+            try:
+                for line in follow_lines(log_path, start_offset=end_offset):
+                    print(line)
+            except KeyboardInterrupt:
+                pass
+
+    except FileNotFoundError as e:
         # 파일이 없는 경우 에러 메시지 출력
-        print(f'파일을 찾을 수 없습니다: {log_path}')
+        print(f'파일을 찾을 수 없습니다: {e.filename or log_path}')
     except PermissionError:
         # 접근 권한이 없는 경우 에러 메시지 출력
         print(f'접근 권한이 없습니다: {log_path} 또는 {output_path}')
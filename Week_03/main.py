@@ -1,9 +1,124 @@
 import csv
+import sys
 import pickle
 
+
+class _Unknown:
+    """
+    'Various'처럼 숫자로 정할 수 없는 값을 나타내는 표식 객체.
+    값이 하나뿐이므로 `value is UNKNOWN`으로 비교한다.
+    """
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'UNKNOWN'
+
+    def __str__(self):
+        return 'Various'
+
+UNKNOWN = _Unknown()
+
+
+def parse_number(text):
+    """
+    숫자 문자열을 float으로 변환하고, 'Various' 등 변환할 수 없는 값은 UNKNOWN으로 둔다.
+    T.C = O(1)
+    S.C = O(1)
+    """
+    try:
+        return float(text)
+    except ValueError:
+        return UNKNOWN
+
+def format_number(value):
+    """
+    parse_number()의 반대. 정수 값은 '0'처럼, 나머지는 원래 문자열과 같은 가장 짧은 표기로 바꾼다.
+    T.C = O(1)
+    S.C = O(1)
+    """
+    if value is UNKNOWN:
+        return str(UNKNOWN)
+    if value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class InventoryItem:
+    """
+    인벤토리 한 행. 읽을 때 한 번만 변환하여 숫자 열은 float(또는 UNKNOWN)으로 보관한다.
+    __slots__를 사용하므로 행마다 사전(__dict__)을 만들지 않아 문자열 리스트보다 메모리를 적게 쓴다.
+    """
+    __slots__ = ('substance', 'weight', 'specific_gravity', 'strength', 'flammability')
+
+    def __init__(self, substance, weight, specific_gravity, strength, flammability):
+        self.substance = substance
+        self.weight = weight
+        self.specific_gravity = specific_gravity
+        self.strength = strength
+        self.flammability = flammability
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        CSV 한 행(문자열 리스트)을 InventoryItem으로 변환한다.
+        strength는 종류가 적으므로 sys.intern()으로 같은 문자열 객체를 공유한다.
+        T.C = O(1)
+        S.C = O(1)
+        """
+        substance, weight, specific_gravity, strength, flammability = row
+        return cls(
+            substance,
+            parse_number(weight),
+            parse_number(specific_gravity),
+            sys.intern(strength),
+            parse_number(flammability),
+        )
+
+    def to_row(self):
+        """
+        CSV로 저장하거나 출력할 수 있도록 문자열 리스트로 되돌린다.
+        T.C = O(1)
+        S.C = O(1)
+        """
+        return [
+            self.substance,
+            format_number(self.weight),
+            format_number(self.specific_gravity),
+            self.strength,
+            format_number(self.flammability),
+        ]
+
+
+class Inventory:
+    """
+    헤더와 InventoryItem 목록을 묶은 인벤토리.
+    정렬, 필터링은 새 Inventory를 반환하며, 행을 다시 변환하지 않고 item을 그대로 공유한다.
+    """
+    __slots__ = ('header', 'items')
+
+    def __init__(self, header, items):
+        self.header = header
+        self.items = items
+
+    def __len__(self):
+        return len(self.items)
+
+    def __bool__(self):
+        return bool(self.header)
+
+    def to_rows(self):
+        """
+        헤더를 포함한 문자열 리스트의 리스트로 변환한다. (기존 CSV, 이진 파일 형식과 같음)
+        T.C = O(n)
+        S.C = O(n)
+        """
+        return [self.header] + [item.to_row() for item in self.items]
+
+
 def read_file(filepath):
     """ 
-    Mars_Base_Inventory_List.csv의 내용을 읽어들여 리스트 객체로 저장하여 반환한다.
+    Mars_Base_Inventory_List.csv의 내용을 읽어들여 Inventory 객체로 저장하여 반환한다.
+    각 행은 읽을 때 한 번만 InventoryItem으로 변환하므로, 이후 정렬과 필터링에서 다시 float()를 호출하지 않는다.
     T.C = O(n)
     - 파일의 모든 행을 순회하므로 시간 복잡도는 O(n)이다.
     S.C = O(n)
@@ -12,104 +127,100 @@ def read_file(filepath):
     try:
         with open(filepath, newline='', encoding='utf-8') as csvfile:
             inventory_reader = csv.reader(csvfile, delimiter=',', quotechar='"') # csv 파일의 내용을 읽는 이터레이터
-            data = list(inventory_reader) # 파일 내용을 저장하는 리스트 객체
-        return data
+            header = next(inventory_reader, []) # 첫 행은 헤더
+            items = [InventoryItem.from_row(row) for row in inventory_reader if row] # 나머지 행을 변환하여 저장
+        return Inventory(header, items)
     except FileNotFoundError:
         print(f'파일을 찾을 수 없습니다: {filepath}')
     except Exception as e:
         print(f'파일을 읽는 중 오류가 발생했습니다: {e}')
-    return [] # 오류가 발생하면 빈 리스트 반환
+    return Inventory([], []) # 오류가 발생하면 빈 인벤토리 반환
         
-def print_file(data, filepath):
+def print_file(inventory, filepath):
     """
     csv 파일의 내용을 출력한다.
     T.C = O(n)
-    - 리스트의 각 행을 한 번씩 반복하므로 O(n)이다.
+    - 각 행을 한 번씩 반복하므로 O(n)이다.
     S.C = O(1)
     - 추가적인 메모리 공간은 없다.
     """
     print('출력:', filepath)
-    if not data:
+    if not inventory:
         print('데이터가 없습니다.')
         return
-    for row in data:
-        print(', '.join(row)) # csv 파일 내용을 출력
+    print(', '.join(inventory.header))
+    for item in inventory.items:
+        print(', '.join(item.to_row())) # csv 파일 내용을 출력
 
-def sort_by_flammability(data):
+def _flammability_key(item):
+    # 인화성을 알 수 없는 항목(UNKNOWN)은 가장 낮은 값으로 취급하여 맨 뒤로 보낸다
+    flammability = item.flammability
+    return float('-inf') if flammability is UNKNOWN else flammability
+
+def sort_by_flammability(inventory):
     """
-    내용을 flammability가 높은 순서로 정렬하고 data_sorted로 반환한다.
-    첫 행은 헤더로 가정한다. 
+    내용을 flammability가 높은 순서로 정렬하고 새 Inventory로 반환한다.
+    flammability는 이미 float이므로 정렬 중 변환이나 예외 처리가 필요 없다.
     T.C = O(n log n)
     - sorted() 함수가 사용하는 Timsort의 시간 복잡도는 O(n log n)이다.
     S.C = O(n)
-    - 새로운 리스트를 복사하고 반환하므로 추가적인 메모리 공간이 필요하다.
+    - item 참조를 담은 새 리스트를 만들어 반환한다.
     """
-    header = data[0]
-    rows = data[1:]
-    try: 
-        rows_sorted = sorted(rows, key=lambda row: float(row[4]), reverse=True)
-    except Exception as e: 
-        print(f'정렬 중 오류 발생: {e}')
-        rows_sorted = rows # 오류 발생 시 정렬하지 않음
-    return [header] + rows_sorted
+    items_sorted = sorted(inventory.items, key=_flammability_key, reverse=True)
+    return Inventory(inventory.header, items_sorted)
 
-def filter_flammability(data, threshold=0.7):
+def filter_flammability(inventory, threshold=0.7):
     """
-    flammability가 임계점 이상인 항목을 filtered_data로 반환한다.
-    첫 행은 헤더로 가정한다.
+    flammability가 임계점 이상인 항목을 새 Inventory로 반환한다.
+    'Various'(UNKNOWN)처럼 값을 알 수 없는 항목은 제외한다.
     T.C = O(n)
-    - 헤더와 필터링한 리스트를 합치므로 O(n)이다.
+    - 각 항목을 한 번씩 비교하므로 O(n)이다.
     S.C = O(n)
-    - 새로운 리스트를 만들고 헤더와 합쳐 반환하므로 O(n)이다.
+    - 조건을 만족하는 item 참조를 담은 새 리스트를 만든다.
     """
-    if not data:
-        return []
-    header = data[0]
-    filtered_data = []
-    for row in data[1:]:
-        try:
-            flammability = float(row[4])
-            if flammability >= threshold:
-                filtered_data.append(row)
-        except ValueError: # 'Various'와 같이 숫자로 변환할 수 없는 경우 무시
-            pass       
-    return [header] + filtered_data
-
-def print_filtered_data(filtered_data, threshold=0.7):
+    filtered_items = [
+        item for item in inventory.items
+        if item.flammability is not UNKNOWN and item.flammability >= threshold
+    ]
+    return Inventory(inventory.header, filtered_items)
+
+def print_filtered_data(filtered_inventory, threshold=0.7):
     """
     flammability 값이 임계점보다 높은 항목을 출력한다.
-    첫 행은 헤더로 가정한다.
     T.C = O(n)
     - 각 행에 대해 for 루프가 실행된다.
     S.C = O(1)
     - 추가 저장 데이터가 없다.
     """
     print('\n인화성 값이 {} 이상인 항목:'.format(threshold))
-    if not filtered_data:
+    if not filtered_inventory:
         print('데이터가 없습니다.')
         return
-    for row in filtered_data:
-        print(', '.join(row))
+    print(', '.join(filtered_inventory.header))
+    for item in filtered_inventory.items:
+        print(', '.join(item.to_row()))
 
-def save_filtered_csv(filtered_data, csv_filename):
+def save_filtered_csv(filtered_inventory, csv_filename):
     """
     필터링한 데이터를 CSV 형식으로 저장한다.
     T.C = O(n)
     - 각 행을 한 번씩 기록하므로 O(n)이다.
     S.C = O(1)
-    - 함수 내부에서 추가로 사용되는 자료구조는 없다.
+    - 행을 하나씩 문자열 리스트로 바꾸어 바로 기록한다.
     """
     try:
         with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
             writer = csv.writer(csvfile, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-            writer.writerows(filtered_data)
+            writer.writerow(filtered_inventory.header)
+            writer.writerows(item.to_row() for item in filtered_inventory.items)
             print(f'\n필터링된 CSV 파일 저장함: {csv_filename}')
     except Exception as e:
         print(f'\nCSV 파일 저장 중 오류 발생: {e}')
         
-def save_sorted_binary(data_sorted, bin_filename):
+def save_sorted_binary(sorted_inventory, bin_filename):
     """
-    정렬된 데이터 data_sorted를 이진 파일로 저장한다.
+    정렬된 인벤토리를 이진 파일로 저장한다.
+    print_binary_file()과 기존 파일이 그대로 동작하도록 헤더를 포함한 문자열 리스트의 리스트로 저장한다.
     T.C = O(n)
     - 모든 요소를 순회하여 직렬화한다.
     S.C = O(n)
@@ -117,7 +228,7 @@ def save_sorted_binary(data_sorted, bin_filename):
     """
     try:
         with open(bin_filename, 'wb') as bin_flie:
-            pickle.dump(data_sorted, bin_flie)
+            pickle.dump(sorted_inventory.to_rows(), bin_flie)
         print(f'\n정렬된 이진 파일 저장 완료: {bin_filename}')
     except Exception as e:
         print(f'\n이진 파일 저장 중 오류 발생: {e}')
@@ -153,17 +264,17 @@ def main():
     bin_filename = 'Mars_Base_Inventory_List.bin'
     csv_filename = 'Mars_Base_Inventory_danger.csv'
 
-    data = read_file(filepath)
-    print_file(data, filepath) # 전체 데이터 출력
+    inventory = read_file(filepath) # 각 행을 한 번만 변환하여 Inventory로 읽음
+    print_file(inventory, filepath) # 전체 데이터 출력
 
 
-    data_sorted = sort_by_flammability(data) # flammability 기준 내림차순으로 데이터 정렬 
-    save_sorted_binary(data_sorted, bin_filename) # 정렬한 데이터를 이진 파일로 저장 
+    inventory_sorted = sort_by_flammability(inventory) # flammability 기준 내림차순으로 데이터 정렬 
+    save_sorted_binary(inventory_sorted, bin_filename) # 정렬한 데이터를 이진 파일로 저장 
     print_binary_file(bin_filename) # 저장한 이진 파일을 출력
 
-    filtered_data = filter_flammability(data, threshold=0.7) # 임계점 기준 데이터 필터링
-    print_filtered_data(filtered_data, threshold=0.7) # 필터링 데이터 출력
-    save_filtered_csv(filtered_data, csv_filename) # 필터링 데이터 별도 CSV 파일로 저장
+    filtered_inventory = filter_flammability(inventory, threshold=0.7) # 임계점 기준 데이터 필터링
+    print_filtered_data(filtered_inventory, threshold=0.7) # 필터링 데이터 출력
+    save_filtered_csv(filtered_inventory, csv_filename) # 필터링 데이터 별도 CSV 파일로 저장
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
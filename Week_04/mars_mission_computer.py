@@ -1,14 +1,391 @@
 import csv
 import os
+import json
+import time
+import array
+import struct
+import mmap
+import bisect
+import atexit
 import datetime
 import random
+import threading
+
+
+class _BufferedLogWriter:
+    '''
+    파일을 열어 둔 채로 기록할 행을 메모리에 모았다가 한 번에 쓰는 로그 작성기의 공통 부분.
+
+    - 모인 행이 max_rows개가 되거나, 마지막 기록 후 flush_interval초가 지나면 파일에 기록함
+    - 행이 더 들어오지 않아도 버퍼에 남은 행은 첫 행이 들어온 뒤 flush_interval초 안에 타이머가 기록함
+    - fsync_interval을 지정하면 그 간격(초)마다 os.fsync로 디스크에 확실히 내려씀 (0이면 매번)
+    - close() 또는 프로세스 종료 시(atexit) 남은 행을 모두 기록하고 파일을 닫음
+    '''
+
+    def __init__(self, filename, max_rows=100, flush_interval=5.0, fsync_interval=None):
+        self.filename = filename
+        self.max_rows = max_rows
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self._rows = []
+        self._lock = threading.Lock()
+        self._file = None
+        self._timer = None
+        # 취소된 타이머가 잠금을 기다리다 늦게 실행되어도 무시하도록 타이머마다 번호를 붙임
+        self._timer_generation = 0
+
+    def _start(self):
+        '''하위 클래스가 파일을 연 뒤 호출함'''
+        self._last_flush = time.monotonic()
+        self._last_fsync = self._last_flush
+        atexit.register(self.close)
+
+    def _write_rows(self, rows):
+        raise NotImplementedError
+
+    def _prepare_row(self, row):
+        '''버퍼에 넣기 전에 행을 변환함. 잘못된 행은 여기서 예외를 발생시켜 버퍼에 들어가지 않게 함'''
+        return row
+
+    def write_row(self, row):
+        '''행 하나를 버퍼에 추가하고, 크기나 시간 기준을 넘으면 기록함'''
+        row = self._prepare_row(row)
+        with self._lock:
+            if self._file is None:
+                raise ValueError('이미 닫힌 로그 파일입니다.')
+            self._rows.append(row)
+            if len(self._rows) >= self.max_rows or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush_locked()
+            elif self._timer is None:
+                self._start_timer_locked()
+
+    def _start_timer_locked(self):
+        self._timer_generation += 1
+        self._timer = threading.Timer(self.flush_interval, self._flush_from_timer, (self._timer_generation,))
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _cancel_timer_locked(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+            self._timer_generation += 1
+
+    def _flush_from_timer(self, generation):
+        with self._lock:
+            if generation != self._timer_generation or self._file is None:
+                return
+            self._timer = None
+            try:
+                self._flush_locked()
+            except OSError:
+                # 기록에 실패한 행은 버퍼에 남아 다음 기록 때 다시 시도함
+                pass
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        self._cancel_timer_locked()
+        if self._rows:
+            self._write_rows(self._rows)
+            self._rows.clear()
+        self._file.flush()
+        now = time.monotonic()
+        self._last_flush = now
+        if self.fsync_interval is not None and now - self._last_fsync >= self.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+
+    def close(self):
+        '''남은 행을 모두 기록하고 파일을 닫음 (여러 번 호출해도 안전함)'''
+        with self._lock:
+            if self._file is None:
+                return
+            try:
+                self._flush_locked()
+            finally:
+                self._file.close()
+                self._file = None
+        atexit.unregister(self.close)
+
+
+class BufferedCsvLogWriter(_BufferedLogWriter):
+    '''CSV 행을 모아서 기록하는 로그 작성기 (파일이 없거나 비어 있으면 header를 먼저 작성)'''
+
+    def __init__(self, filename, header=None, max_rows=100, flush_interval=5.0, fsync_interval=None):
+        super().__init__(filename, max_rows, flush_interval, fsync_interval)
+        write_header = header is not None and (not os.path.exists(filename) or os.path.getsize(filename) == 0)
+        self._file = open(filename, 'a', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        if write_header:
+            self._writer.writerow(header)
+            self._file.flush()
+        self._start()
+
+    def _write_rows(self, rows):
+        self._writer.writerows(rows)
+
+
+# 바이너리 로그 파일 구조: 매직(4바이트) + 헤더 길이(uint32) + 헤더(JSON) + 고정 길이 레코드의 연속
+BINARY_LOG_MAGIC = b'MENV'
+_BINARY_HEADER_LENGTH = struct.Struct('<I')
+
+
+class BufferedBinaryLogWriter(_BufferedLogWriter):
+    '''
+    struct 형식(record_format)의 고정 길이 레코드를 모아서 기록하는 바이너리 로그 작성기.
+    파일 앞부분 헤더에 필드 이름, 단위, 레코드 형식을 JSON으로 저장하여 읽을 때 문자열 해석이 필요 없음.
+    '''
+
+    def __init__(self, filename, fields, units, record_format, max_rows=100, flush_interval=5.0,
+                 fsync_interval=None):
+        super().__init__(filename, max_rows, flush_interval, fsync_interval)
+        self._record = struct.Struct(record_format)
+        header = json.dumps({'fields': list(fields), 'units': list(units), 'record_format': record_format},
+                            ensure_ascii=False).encode('utf-8')
+
+        if os.path.exists(filename) and os.path.getsize(filename) > 0:
+            # 이어서 기록할 때는 기존 헤더와 형식이 같은지 확인
+            existing_header, _ = _read_binary_log_header(filename)
+            if existing_header != json.loads(header):
+                raise ValueError(f'{filename}의 레코드 형식이 현재 센서 구성과 다릅니다.')
+            self._file = open(filename, 'ab')
+        else:
+            self._file = open(filename, 'wb')
+            self._file.write(BINARY_LOG_MAGIC + _BINARY_HEADER_LENGTH.pack(len(header)) + header)
+            self._file.flush()
+        self._start()
+
+    def _prepare_row(self, row):
+        # 추가할 때 바로 레코드로 변환하여, 잘못된 행(None 값 등)은 그 행만 거부되고 버퍼에는 남지 않음
+        return self._record.pack(*row)
+
+    def _write_rows(self, rows):
+        self._file.write(b''.join(rows))
+
+
+def _read_binary_log_header(filename):
+    '''바이너리 로그의 헤더(dict)와 첫 레코드의 시작 위치를 반환함'''
+    with open(filename, 'rb') as f:
+        magic = f.read(len(BINARY_LOG_MAGIC))
+        if magic != BINARY_LOG_MAGIC:
+            raise ValueError(f'{filename}은 센서 바이너리 로그가 아닙니다.')
+        (header_length,) = _BINARY_HEADER_LENGTH.unpack(f.read(_BINARY_HEADER_LENGTH.size))
+        header = json.loads(f.read(header_length).decode('utf-8'))
+    return header, len(BINARY_LOG_MAGIC) + _BINARY_HEADER_LENGTH.size + header_length
+
+
+def read_binary_log(filename):
+    '''
+    바이너리 로그를 읽어 (헤더, 열 사전)을 반환함.
+    열 사전은 {'timestamp': array('d'), 센서 이름: array('f'), ...} 형태로, 값이 이미 숫자임.
+    '''
+    header, data_offset = _read_binary_log_header(filename)
+    record = struct.Struct(header['record_format'])
+    with open(filename, 'rb') as f:
+        f.seek(data_offset)
+        data = f.read()
+    usable = len(data) - len(data) % record.size # 기록 중 잘린 마지막 레코드는 무시
+
+    columns = {'timestamp': array.array('d')}
+    for field in header['fields']:
+        columns[field] = array.array('f')
+    column_list = list(columns.values())
+    for values in record.iter_unpack(data[:usable]):
+        for column, value in zip(column_list, values):
+            column.append(value)
+    return header, columns
+
+
+def read_wide_log(filename):
+    '''
+    wide 형식 CSV 로그를 읽어 (열 이름 목록, 행 목록)을 반환함.
+    각 행은 [timestamp 문자열, 센서 값(float) ...]이며, 값이 비어 있으면 None임.
+    '''
+    rows = []
+    with open(filename, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        for row in reader:
+            rows.append([row[0]] + [float(value) if value else None for value in row[1:]])
+    return header, rows
+
+
+class SensorTimeSeriesStore:
+    '''
+    센서별 시계열을 열(column) 단위의 고정 길이 배열 파일로 저장하는 추가 전용(append-only) 저장소.
+
+    root_dir/YYYY-MM-DD/<센서>.ts   : 타임스탬프 (epoch 초, float64)
+    root_dir/YYYY-MM-DD/<센서>.val  : 측정값 (float64)
+
+    - 날짜가 바뀌면 새 일별 세그먼트 디렉터리에 기록함
+    - 조회 시 해당 날짜 세그먼트만 mmap으로 열고, 타임스탬프를 이진 탐색하여 필요한 구간만 복사함
+    - 한 센서의 타임스탬프는 세그먼트 안에서 감소하지 않아야 함
+    '''
+
+    ITEM = array.array('d').itemsize
+
+    def __init__(self, root_dir='env_store'):
+        self.root_dir = root_dir
+        os.makedirs(root_dir, exist_ok=True)
+        self._segment_name = None
+        self._files = {}           # 센서 -> (타임스탬프 파일, 값 파일)
+        self._last_timestamps = {} # 센서 -> 현재 세그먼트의 마지막 타임스탬프
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    @staticmethod
+    def segment_name_for(timestamp):
+        return datetime.datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')
+
+    def _open_segment(self, segment_name):
+        '''다른 날짜의 세그먼트로 넘어갈 때 열린 파일을 모두 닫음'''
+        self._close_files()
+        self._segment_name = segment_name
+        os.makedirs(os.path.join(self.root_dir, segment_name), exist_ok=True)
+
+    def _files_for(self, sensor):
+        files = self._files.get(sensor)
+        if files is None:
+            base = os.path.join(self.root_dir, self._segment_name, sensor)
+            # 기록 중 잘린 항목이 남아 있으면 두 파일을 공통된 온전한 항목 수까지 잘라 내어 이후 항목의 위치를 맞춤
+            sizes = [os.path.getsize(path) if os.path.exists(path) else 0 for path in (base + '.ts', base + '.val')]
+            whole_size = min(sizes) // self.ITEM * self.ITEM
+            for path, size in zip((base + '.ts', base + '.val'), sizes):
+                if size > whole_size:
+                    os.truncate(path, whole_size)
+            # 이미 기록된 세그먼트에 이어 쓰는 경우 마지막 타임스탬프(파일 끝 8바이트)만 읽어 순서를 확인함
+            if whole_size:
+                with open(base + '.ts', 'rb') as ts_file:
+                    ts_file.seek(whole_size - self.ITEM)
+                    self._last_timestamps[sensor] = struct.unpack('<d', ts_file.read(self.ITEM))[0]
+            files = (open(base + '.ts', 'ab'), open(base + '.val', 'ab'))
+            self._files[sensor] = files
+        return files
+
+    def append(self, sensor, timestamp, value):
+        '''센서 값 하나를 추가함'''
+        with self._lock:
+            segment_name = self.segment_name_for(timestamp)
+            if segment_name != self._segment_name:
+                self._open_segment(segment_name)
+            ts_file, value_file = self._files_for(sensor)
+            if timestamp < self._last_timestamps.get(sensor, float('-inf')):
+                raise ValueError(f'{sensor}의 타임스탬프가 이전 값보다 작습니다: {timestamp}')
+            ts_file.write(struct.pack('<d', timestamp))
+            value_file.write(struct.pack('<d', value))
+            self._last_timestamps[sensor] = timestamp
+
+    def append_sample(self, timestamp, values):
+        '''{센서: 값} 사전의 값을 같은 타임스탬프로 모두 추가함 (None 값은 건너뜀)'''
+        for sensor, value in values.items():
+            if value is not None:
+                self.append(sensor, timestamp, value)
+
+    def flush(self):
+        with self._lock:
+            for ts_file, value_file in self._files.values():
+                ts_file.flush()
+                value_file.flush()
+
+    def _close_files(self):
+        for ts_file, value_file in self._files.values():
+            ts_file.close()
+            value_file.close()
+        self._files = {}
+        self._last_timestamps = {}
+
+    def close(self):
+        with self._lock:
+            self._close_files()
+            self._segment_name = None
+
+    def segments(self):
+        '''저장된 일별 세그먼트 이름 목록 (날짜순)'''
+        return sorted(name for name in os.listdir(self.root_dir)
+                      if os.path.isdir(os.path.join(self.root_dir, name)))
+
+    def _read_segment(self, segment_name, sensor, start, end):
+        '''
+        세그먼트 하나를 mmap으로 열어 start <= 타임스탬프 < end 구간만 배열로 복사함.
+        start나 end가 None이면 그쪽 경계는 제한하지 않음.
+        '''
+        base = os.path.join(self.root_dir, segment_name, sensor)
+        timestamps, values = array.array('d'), array.array('d')
+        try:
+            ts_file = open(base + '.ts', 'rb')
+            value_file = open(base + '.val', 'rb')
+        except FileNotFoundError:
+            return timestamps, values
+
+        with ts_file, value_file:
+            # 기록 중 잘린 마지막 항목은 두 파일에 모두 있는 개수까지만 사용
+            count = min(os.fstat(ts_file.fileno()).st_size, os.fstat(value_file.fileno()).st_size) // self.ITEM
+            if count == 0:
+                return timestamps, values
+            with mmap.mmap(ts_file.fileno(), 0, access=mmap.ACCESS_READ) as ts_map:
+                # 온전한 항목까지만 잘라낸 뒤 float64로 해석함 (파일 끝의 잘린 바이트는 무시)
+                with memoryview(ts_map) as ts_bytes, ts_bytes[:count * self.ITEM] as ts_whole, \
+                        ts_whole.cast('d') as ts_view:
+                    low = 0 if start is None else bisect.bisect_left(ts_view, start)
+                    high = count if end is None else bisect.bisect_left(ts_view, end)
+                if low >= high:
+                    return timestamps, values
+                timestamps.frombytes(ts_map[low * self.ITEM:high * self.ITEM])
+            with mmap.mmap(value_file.fileno(), 0, access=mmap.ACCESS_READ) as value_map:
+                values.frombytes(value_map[low * self.ITEM:high * self.ITEM])
+        return timestamps, values
+
+    def query(self, sensor, start, end):
+        '''
+        start <= 타임스탬프 < end 구간의 (타임스탬프 배열, 값 배열)을 반환함.
+        start, end는 epoch 초 또는 datetime이며, 겹치는 날짜의 세그먼트만 읽음.
+        '''
+        if isinstance(start, datetime.datetime):
+            start = start.timestamp()
+        if isinstance(end, datetime.datetime):
+            end = end.timestamp()
+        self.flush()
+
+        first_segment = self.segment_name_for(start)
+        last_segment = self.segment_name_for(end)
+        timestamps, values = array.array('d'), array.array('d')
+        for segment_name in self.segments():
+            if first_segment <= segment_name <= last_segment:
+                segment_timestamps, segment_values = self._read_segment(segment_name, sensor, start, end)
+                timestamps.extend(segment_timestamps)
+                values.extend(segment_values)
+        return timestamps, values
+
 
 class DummySensor:
-    '''더미 센서 클래스'''
+    '''
+    더미 센서 클래스
+
+    log_format으로 로그 형식을 선택함
+    - 'long': 읽은 값마다 한 행 (Timestamp, Sensor, Reading), 기존 형식
+    - 'wide': 측정 한 번에 한 행, 센서마다 숫자 열 하나 (단위는 헤더에 표기)
+    - 'binary': 측정 한 번에 고정 길이 레코드 하나 (timestamp double + 센서 값 float)
+
+    store에 SensorTimeSeriesStore를 넘기면 측정값을 시계열 저장소에도 함께 추가함
+
+    max_rows, flush_interval, fsync_interval은 로그 작성기에 그대로 전달함
+    - max_rows: 몇 행을 모았다가 기록할지
+    - flush_interval: 모인 행을 늦어도 몇 초 안에 기록할지
+    - fsync_interval: 몇 초마다 디스크에 내려쓸지 (None이면 하지 않음, 0이면 기록할 때마다)
+    '''
 
     LOG_FILENAME = 'env_log.csv' # 저장할 로그 파일
+    LOG_FILENAMES = {
+        'long': LOG_FILENAME,
+        'wide': 'env_log_wide.csv',
+        'binary': 'env_log.bin',
+    }
 
-    def __init__(self):
+    def __init__(self, log_format='long', store=None, max_rows=100, flush_interval=5.0, fsync_interval=None):
         self.env_values = {
             'mars_base_internal_temperature': None,    # 화성 기지 내부 온도
             'mars_base_external_temperature': None,    # 화성 기지 외부 온도
@@ -26,26 +403,65 @@ class DummySensor:
             'mars_base_internal_co2': '%',
             'mars_base_internal_oxygen': '%'
         }
-        # 로그 파일이 없으면 헤더 작성
+        # 로그 파일은 한 번만 열어 두고 행을 모아서 기록 (파일이 없으면 헤더 작성)
+        if log_format not in self.LOG_FILENAMES:
+            raise ValueError(f'지원하지 않는 로그 형식입니다: {log_format}')
+        self.log_format = log_format
+        self.store = store
+        self.max_rows = max_rows
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
         try:
-            if not os.path.exists(self.LOG_FILENAME):
-                with open(self.LOG_FILENAME, 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerow(['Timestamp', 'Sensor', 'Reading'])
+            self.log_writer = self._create_log_writer()
         except Exception:
-            pass
+            self.log_writer = None
+
+    def _create_log_writer(self):
+        filename = self.LOG_FILENAMES[self.log_format]
+        buffering = {
+            'max_rows': self.max_rows,
+            'flush_interval': self.flush_interval,
+            'fsync_interval': self.fsync_interval,
+        }
+        if self.log_format == 'long':
+            return BufferedCsvLogWriter(filename, header=['Timestamp', 'Sensor', 'Reading'], **buffering)
+        fields = list(self.env_values)
+        units = [self.units[field] for field in fields]
+        if self.log_format == 'wide':
+            header = ['timestamp'] + [f'{field}({unit})' for field, unit in zip(fields, units)]
+            return BufferedCsvLogWriter(filename, header=header, **buffering)
+        return BufferedBinaryLogWriter(filename, fields, units, '<d' + 'f' * len(fields), **buffering)
 
 
     def log(self, sensor, reading):
-        '''현재 시각과 함께 센서의 값을 CSV 형식으로 기록'''
+        '''현재 시각과 함께 센서의 값을 CSV 형식으로 기록 (버퍼에 모았다가 한 번에 기록)'''
+        if self.log_writer is None:
+            return
         try:
             timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            with open(self.LOG_FILENAME, 'a', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow([timestamp, sensor, reading])
+            self.log_writer.write_row([timestamp, sensor, reading])
+        except Exception:
+            pass
+
+    def log_sample(self):
+        '''현재 env_values 전체를 한 행(wide) 또는 한 레코드(binary)로 기록'''
+        if self.log_writer is None:
+            return
+        try:
+            values = [self.env_values[field] for field in self.env_values]
+            if self.log_format == 'binary':
+                self.log_writer.write_row([time.time()] + values)
+            else:
+                timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                self.log_writer.write_row([timestamp] + ['' if value is None else f'{value:.2f}' for value in values])
         except Exception:
             pass
 
+    def close(self):
+        '''버퍼에 남은 로그를 모두 기록하고 로그 파일을 닫음'''
+        if self.log_writer is not None:
+            self.log_writer.close()
+
     def set_env(self):
         '''각 데이터의 값을 범위 내에서 랜덤으로 생성하고 로그 파일에 기록'''
         try:
@@ -58,6 +474,16 @@ class DummySensor:
         except Exception:
             pass
 
+        if self.store is not None:
+            try:
+                self.store.append_sample(time.time(), self.env_values)
+            except Exception:
+                pass
+
+        if self.log_format != 'long':
+            self.log_sample()
+            return
+
         # env_values의 각 값을 로그 파일에 기록 
         for key, value in self.env_values.items():
             try:
@@ -68,16 +494,23 @@ class DummySensor:
 
     def get_env(self):
         return self.env_values
-    
-'''DummySensor의 인스턴스인 ds 객체 생성'''
-ds = DummySensor()
-try:
-    ds.set_env()
-except Exception:
-    pass
-env_data = ds.get_env()
-for key, value in env_data.items():
+
+
+def main():
+    '''DummySensor의 인스턴스인 ds 객체를 생성하고 측정값을 한 번 출력'''
+    ds = DummySensor()
     try:
-        print(f'{key}: {value:.2f}{ds.units[key]}')
+        ds.set_env()
     except Exception:
-        print(f'{key}: {value}')
\ No newline at end of file
+        pass
+    env_data = ds.get_env()
+    for key, value in env_data.items():
+        try:
+            print(f'{key}: {value:.2f}{ds.units[key]}')
+        except Exception:
+            print(f'{key}: {value}')
+    ds.close()
+
+
+if __name__ == '__main__':
+    main()
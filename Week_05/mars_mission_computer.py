@@ -1,8 +1,630 @@
+import re
+import sys
+import json
 import time
+import math
+import operator
+import queue
+import socket
+import asyncio
+import threading
+import inspect
+import concurrent.futures
+import argparse
 from Week_04.mars_mission_computer import DummySensor
 
-class MissionComputer:
+
+class SensorBusyError(RuntimeError):
+    """이전 읽기가 아직 끝나지 않아 이번 틱의 읽기를 건너뜀"""
+
+
+class SensorSource:
+    """
+    비동기 수집 엔진이 주기적으로 읽을 센서 하나.
+
+    :param name: 센서 이름 (큐에 넣는 측정값의 'source')
+    :param read: 값을 읽는 함수. 일반 함수면 센서 전용 스레드에서, 코루틴 함수면 이벤트 루프에서 실행함
+    :param period: 읽기 주기(초)
+    :param timeout: 한 번 읽을 때 허용하는 최대 시간(초), 넘으면 오류 측정값을 넣음
+
+    일반 함수는 센서마다 스레드 하나짜리 실행기에서 실행하므로, 멈춘 센서가 공용 스레드 풀을 채워
+    다른 센서를 막지 못함. 제한 시간이 지나도 스레드는 멈출 수 없으므로, 이전 읽기가 아직 끝나지 않았으면
+    새 읽기를 시작하지 않고 SensorBusyError를 발생시킴.
+    """
+
+    def __init__(self, name, read, period=5.0, timeout=None):
+        self.name = name
+        self.read = read
+        self.period = period
+        self.timeout = timeout if timeout is not None else period
+        self._executor = None
+        self._in_flight = None # 실행 중인 읽기 (concurrent.futures.Future)
+
+    async def read_once(self):
+        """값을 한 번 읽음. timeout초 안에 끝나지 않으면 asyncio.TimeoutError를 발생시킴"""
+        if inspect.iscoroutinefunction(self.read):
+            return await asyncio.wait_for(self.read(), self.timeout)
+        if self._in_flight is not None and not self._in_flight.done():
+            raise SensorBusyError(f'previous read of {self.name} still running')
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f'sensor-{self.name}')
+        self._in_flight = self._executor.submit(self.read)
+        # 스레드의 읽기는 취소할 수 없으므로 wait_for 대신 wait로 기다리기만 함 (취소할 내부 태스크를 만들지 않음)
+        future = asyncio.wrap_future(self._in_flight)
+        done, _ = await asyncio.wait({future}, timeout=self.timeout)
+        if not done:
+            raise asyncio.TimeoutError
+        return future.result()
+
+    def close(self):
+        """센서 전용 스레드를 정리함 (멈춘 읽기를 기다리지 않음)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._in_flight = None
+
+
+class AsyncAcquisitionEngine:
+    """
+    여러 SensorSource를 각자의 주기와 제한 시간으로 동시에 읽어 공유 asyncio.Queue에 넣는 수집 엔진.
+
+    - 각 센서는 독립된 태스크와 전용 스레드에서 돌기 때문에 느리거나 멈춘 센서가 다른 센서를 지연시키지 않음
+    - 다음 읽기 시각은 단조 시계(loop.time()) 기준으로 start + n * period로 정하므로,
+      처리 시간만큼 주기가 밀리지 않음 (읽기가 주기보다 오래 걸리면 놓친 틱은 건너뜀)
+    - 큐에 넣는 측정값: {'source', 'tick', 'timestamp', 'value', 'error'}
+    """
+
+    def __init__(self, sources=None, queue=None, queue_size=0):
+        self.sources = list(sources or [])
+        self.queue = queue
+        self.queue_size = queue_size
+        self._tasks = []
+
+    def add_source(self, source):
+        self.sources.append(source)
+
+    async def start(self):
+        if self.queue is None:
+            self.queue = asyncio.Queue(self.queue_size)
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        self._tasks = [asyncio.create_task(self._poll(source, start_time)) for source in self.sources]
+        return self.queue
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for source in self.sources:
+            source.close()
+
+    async def _poll(self, source, start_time):
+        loop = asyncio.get_running_loop()
+        tick = 0
+        while True:
+            reading = {'source': source.name, 'tick': tick, 'timestamp': time.time(), 'value': None, 'error': None}
+            try:
+                reading['value'] = await source.read_once()
+            except asyncio.TimeoutError:
+                reading['error'] = f'timeout after {source.timeout}s'
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                reading['error'] = str(e)
+            await self.queue.put(reading)
+
+            # 시작 시각 기준의 다음 틱으로 이동 (이미 지난 틱은 건너뜀)
+            tick += 1
+            now = loop.time()
+            next_time = start_time + tick * source.period
+            if next_time < now:
+                tick = math.ceil((now - start_time) / source.period)
+                next_time = start_time + tick * source.period
+            await asyncio.sleep(next_time - now)
+
+
+class RunningStats:
+    """
+    값을 저장하지 않고 개수/합/최소/최대/분산을 갱신하는 누적 통계 (Welford 알고리즘).
+    merge()로 다른 RunningStats를 합칠 수 있음 (Chan의 병렬 분산 공식).
+    """
+
+    __slots__ = ('count', 'total', 'mean', 'm2', 'minimum', 'maximum')
+
     def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.total, self.mean, self.m2 = other.count, other.total, other.mean, other.m2
+            self.minimum, self.maximum = other.minimum, other.maximum
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def variance(self):
+        """표본 분산 (값이 2개 미만이면 None)"""
+        return self.m2 / (self.count - 1) if self.count > 1 else None
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'mean': self.mean if self.count else None,
+            'min': self.minimum,
+            'max': self.maximum,
+            'variance': self.variance,
+        }
+
+
+class TumblingWindow:
+    """
+    length초 길이로 겹치지 않게 나뉘는 창. 창이 끝나면 센서별 RunningStats를 돌려주고 새로 시작함.
+    창 하나당 센서별 RunningStats 하나만 유지하므로 메모리는 샘플 수와 무관함.
+    """
+
+    def __init__(self, length):
+        self.length = length
+        self.window_start = None
+        self.stats = {}
+
+    def add(self, key, value, now):
+        if self.window_start is None:
+            self.window_start = now
+        self.stats.setdefault(key, RunningStats()).add(value)
+
+    def roll(self, now):
+        """창이 끝났으면 (창 시작 시각, 센서별 통계)를 반환하고 다음 창을 시작함, 아니면 None"""
+        if self.window_start is None or now - self.window_start < self.length:
+            return None
+        closed = (self.window_start, self.stats)
+        self.window_start = now
+        self.stats = {}
+        return closed
+
+
+class SlidingWindow:
+    """
+    최근 length초를 다루는 미끄러지는 창. 창을 buckets개의 구간으로 나눈 원형 버퍼에
+    구간별 RunningStats만 두고, 조회할 때 살아 있는 구간을 합침.
+    메모리는 (구간 수 x 센서 수)로 고정되며, 정밀도는 구간 폭(length / buckets)만큼임.
+    """
+
+    def __init__(self, length, buckets=60):
+        self.length = length
+        self.buckets = buckets
+        self.bucket_width = length / buckets
+        self._bucket_ids = [None] * buckets
+        self._bucket_stats = [None] * buckets
+
+    def add(self, key, value, now):
+        bucket_id = int(now // self.bucket_width)
+        slot = bucket_id % self.buckets
+        if self._bucket_ids[slot] != bucket_id:
+            # 오래된 구간을 재사용
+            self._bucket_ids[slot] = bucket_id
+            self._bucket_stats[slot] = {}
+        self._bucket_stats[slot].setdefault(key, RunningStats()).add(value)
+
+    def snapshot(self, now):
+        """현재 창(최근 length초)에 포함된 센서별 통계를 합쳐서 반환함"""
+        newest = int(now // self.bucket_width)
+        merged = {}
+        for bucket_id, stats in zip(self._bucket_ids, self._bucket_stats):
+            if bucket_id is None or not newest - self.buckets < bucket_id <= newest:
+                continue
+            for key, bucket in stats.items():
+                merged.setdefault(key, RunningStats()).merge(bucket)
+        return merged
+
+
+class StreamingWindowAggregator:
+    """
+    여러 길이의 텀블링/슬라이딩 창(예: 1분, 5분, 1시간)에 같은 측정값을 동시에 반영함.
+    측정값 하나당 비용은 창 수에 비례하는 O(1)이며, 값 목록을 저장하지 않음.
+    """
+
+    def __init__(self, windows=None):
+        self.windows = list(windows or [])
+
+    def add_sample(self, values, now=None):
+        """
+        {센서: 값} 사전을 모든 창에 반영하고, 이번에 끝난 텀블링 창의 (창, 시작 시각, 통계) 목록을 반환함.
+        숫자가 아닌 값(None 등)은 건너뜀.
+        """
+        if now is None:
+            now = time.monotonic()
+        closed = []
+        for window in self.windows:
+            if isinstance(window, TumblingWindow):
+                # 원래 5분 평균처럼 경계 시점의 값까지 끝나는 창에 포함함
+                for key, value in values.items():
+                    if isinstance(value, (int, float)):
+                        window.add(key, value, now)
+                result = window.roll(now)
+                if result is not None:
+                    closed.append((window, result[0], result[1]))
+            else:
+                for key, value in values.items():
+                    if isinstance(value, (int, float)):
+                        window.add(key, value, now)
+        return closed
+
+    def sliding_snapshots(self, now=None):
+        """모든 슬라이딩 창의 현재 통계를 {창 길이: {센서: RunningStats}}로 반환함"""
+        if now is None:
+            now = time.monotonic()
+        return {window.length: window.snapshot(now) for window in self.windows if isinstance(window, SlidingWindow)}
+
+
+def window_label(length):
+    """창 길이(초)를 '5 MINUTE'과 같은 출력용 문자열로 바꿈"""
+    if length % 3600 == 0:
+        return f'{int(length // 3600)} HOUR'
+    if length % 60 == 0:
+        return f'{int(length // 60)} MINUTE'
+    return f'{length:g} SECOND'
+
+
+def _json_safe(value):
+    """NaN/Infinity처럼 JSON에 없는 실수 값을 null(None)로 바꿈 (중첩된 dict/list 포함)"""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    return value
+
+
+def to_json(data, indent=None):
+    """
+    :param data: JSON으로 바꿀 데이터 (dict, list, 숫자, 문자열, None 등)
+    :param indent: 들여쓰기 칸 수. None이면 한 줄짜리 압축 형식
+    :return: JSON 문서 문자열
+
+    - 문자열은 따옴표와 이스케이프를 포함한 올바른 JSON 문자열로, None은 null로 변환함
+    - NaN/Infinity는 null로, JSON으로 표현할 수 없는 객체는 str()로 변환함
+    """
+    try:
+        return json.dumps(data, ensure_ascii=False, indent=indent, allow_nan=False, default=str)
+    except ValueError:
+        return json.dumps(_json_safe(data), ensure_ascii=False, indent=indent, allow_nan=False, default=str)
+
+
+class StdoutSink:
+    """JSON 문서를 표준 출력에 한 번의 write로 출력함 (기본은 4칸 들여쓰기)"""
+
+    def __init__(self, indent=4, stream=None):
+        self.indent = indent
+        self.stream = stream
+
+    def write(self, data):
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write(to_json(data, self.indent) + '\n')
+        stream.flush()
+
+    def close(self):
+        pass
+
+
+class NdjsonFileSink:
+    """JSON 문서를 한 줄에 하나씩(NDJSON) 파일에 덧붙임"""
+
+    def __init__(self, filename, flush_each=True):
+        self.filename = filename
+        self.flush_each = flush_each
+        self._file = open(filename, 'a', encoding='utf-8')
+
+    def write(self, data):
+        self._file.write(to_json(data) + '\n')
+        if self.flush_each:
+            self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class UnixSocketSink:
+    """
+    JSON 문서를 한 줄에 하나씩 UNIX 도메인 소켓(스트림)으로 보냄.
+
+    write()는 문서를 크기가 제한된 큐에 넣기만 하고, 실제 전송은 백그라운드 스레드가 함.
+    따라서 받는 쪽이 느리거나 끊겨도 이벤트 루프(수집 작업)가 멈추지 않음.
+    - 큐가 가득 차면 새 문서를 버리고 dropped를 늘림 (write()와 전송 스레드가 함께 세므로 잠금 안에서 늘림)
+    - 연결이 끊기면 reconnect_interval초마다 다시 연결을 시도하고, 그동안의 문서는 버림
+    - 오류는 끊길 때 한 번만 표준 오류로 알림
+
+    :param path: 소켓 경로
+    :param max_pending: 보내지 못하고 기다릴 수 있는 최대 문서 수
+    :param reconnect_interval: 다시 연결을 시도하는 간격(초)
+    :param send_timeout: 한 문서를 보낼 때 허용하는 최대 시간(초)
+    """
+
+    def __init__(self, path, max_pending=1000, reconnect_interval=1.0, send_timeout=5.0):
+        if not hasattr(socket, 'AF_UNIX'):
+            raise OSError('이 운영체제는 UNIX 도메인 소켓을 지원하지 않습니다.')
+        self.path = path
+        self.reconnect_interval = reconnect_interval
+        self.send_timeout = send_timeout
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._sock = None
+        self._next_connect = 0.0
+        self._connected_once = None
+        self._pending = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name='UnixSocketSink', daemon=True)
+        self._thread.start()
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.send_timeout)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+
+    def write(self, data):
+        """문서를 전송 큐에 넣음 (막히지 않으며 예외를 발생시키지 않음)"""
+        try:
+            self._pending.put_nowait((to_json(data) + '\n').encode('utf-8'))
+        except queue.Full:
+            self._count_dropped()
+
+    def _count_dropped(self):
+        with self._dropped_lock:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            payload = self._pending.get()
+            if payload is None:
+                return
+            self._send(payload)
+
+    def _send(self, payload):
+        if self._sock is None:
+            # 연결이 끊긴 동안에는 재시도 간격마다 한 번만 연결을 시도하고, 나머지 문서는 버림
+            if time.monotonic() < self._next_connect:
+                self._count_dropped()
+                return
+            try:
+                self._connect()
+            except OSError as e:
+                self._next_connect = time.monotonic() + self.reconnect_interval
+                self._report_down(e)
+                self._count_dropped()
+                return
+        try:
+            self._sock.sendall(payload)
+            self._connected_once = True
+        except OSError as e:
+            self._close_socket()
+            self._next_connect = time.monotonic() + self.reconnect_interval
+            self._report_down(e)
+            self._count_dropped()
+
+    def _report_down(self, error):
+        # 연결된 적이 있거나 처음 실패할 때만 알려서, 끊긴 동안 같은 메시지가 반복되지 않게 함
+        if self._connected_once is not False:
+            print(f'경고: 소켓 {self.path}로 보낼 수 없어 다시 연결될 때까지 문서를 버립니다: {error}',
+                  file=sys.stderr)
+        self._connected_once = False
+
+    def _close_socket(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def close(self, timeout=1.0):
+        """남은 문서를 timeout초 안에서 보내고 소켓을 닫음"""
+        if self._thread.is_alive():
+            try:
+                self._pending.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            self._thread.join(timeout)
+        self._close_socket()
+
+
+_COMPARATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+}
+
+_ALERT_RULE_PATTERN = re.compile(
+    r'^\s*(?P<sensor>\w+)\s+(?P<rate>rate\s+)?(?P<op>>=|<=|>|<)\s*(?P<limit>[-+]?\d+(?:\.\d+)?)(?:\s*/\s*s)?'
+    r'(?:\s+for\s+(?P<duration>\d+(?:\.\d+)?)\s*s?)?'
+    r'(?:\s+hysteresis\s+(?P<hysteresis>\d+(?:\.\d+)?))?\s*$'
+)
+
+
+class AlertRule:
+    """
+    센서 하나에 대한 경보 규칙과 그 평가 상태.
+
+    :param sensor: 센서 이름
+    :param op: 비교 연산자 ('>', '>=', '<', '<=')
+    :param limit: 기준값 (rate=True면 초당 변화량의 절댓값 기준)
+    :param duration: 조건이 이 시간(초) 동안 계속 참이어야 경보를 발생시킴 (0이면 즉시)
+    :param hysteresis: 경보 해제 시 기준값에서 이만큼 더 돌아와야 해제함 (경보가 깜빡이는 것을 막음)
+    :param rate: True면 값 대신 직전 측정값 대비 초당 변화량으로 판단
+    """
+
+    def __init__(self, sensor, op, limit, duration=0.0, hysteresis=0.0, rate=False, name=None):
+        if op not in _COMPARATORS:
+            raise ValueError(f'지원하지 않는 비교 연산자입니다: {op}')
+        self.sensor = sensor
+        self.op = op
+        self.limit = limit
+        self.duration = duration
+        self.hysteresis = hysteresis
+        self.rate = rate
+        self.name = name or self.describe()
+        self._compare = _COMPARATORS[op]
+        # 해제 기준: '>' 계열은 limit - hysteresis 이하, '<' 계열은 limit + hysteresis 이상으로 돌아와야 함
+        if op in ('>', '>='):
+            self._clear_limit = limit - hysteresis
+            self._is_cleared = lambda value: value <= self._clear_limit
+        else:
+            self._clear_limit = limit + hysteresis
+            self._is_cleared = lambda value: value >= self._clear_limit
+        self.active = False
+        self._pending_since = None
+        self._previous = None
+
+    def describe(self):
+        text = f"{self.sensor} {'rate ' if self.rate else ''}{self.op} {self.limit:g}{'/s' if self.rate else ''}"
+        if self.duration:
+            text += f' for {self.duration:g}s'
+        if self.hysteresis:
+            text += f' hysteresis {self.hysteresis:g}'
+        return text
+
+    def evaluate(self, value, now):
+        """
+        측정값 하나로 상태를 갱신하고, 상태가 바뀌면 'raised' 또는 'cleared'를, 아니면 None을 반환함 (O(1)).
+        """
+        if self.rate:
+            previous = self._previous
+            self._previous = (value, now)
+            if previous is None or now <= previous[1]:
+                return None
+            value = abs(value - previous[0]) / (now - previous[1])
+
+        if not self.active:
+            if not self._compare(value, self.limit):
+                self._pending_since = None
+                return None
+            if self._pending_since is None:
+                self._pending_since = now
+            if now - self._pending_since >= self.duration:
+                self.active = True
+                return 'raised'
+            return None
+
+        if self._is_cleared(value):
+            self.active = False
+            self._pending_since = None
+            return 'cleared'
+        return None
+
+
+def parse_alert_rule(text):
+    """
+    'mars_base_internal_co2 > 0.08 for 30s hysteresis 0.005'
+    'mars_base_internal_temperature rate > 0.5/s'
+    형식의 문자열을 AlertRule로 변환함.
+    """
+    match = _ALERT_RULE_PATTERN.match(text)
+    if match is None:
+        raise ValueError(f'경보 규칙을 해석할 수 없습니다: {text}')
+    return AlertRule(
+        match.group('sensor'),
+        match.group('op'),
+        float(match.group('limit')),
+        duration=float(match.group('duration') or 0),
+        hysteresis=float(match.group('hysteresis') or 0),
+        rate=match.group('rate') is not None,
+    )
+
+
+class AlertEngine:
+    """
+    센서 이름으로 색인된 경보 규칙을 측정값마다 평가함.
+    측정값 하나는 해당 센서의 규칙만 평가하므로 전체 규칙 수가 늘어나도 비용이 일정함.
+    상태가 바뀔 때만(발생/해제) 이벤트를 만들기 때문에 같은 경보가 반복해서 나가지 않음.
+
+    :param sink: 이벤트를 기록할 대상 (write(data)를 가진 객체, 예: NdjsonFileSink)
+    :param callback: 이벤트마다 호출할 함수 callback(event)
+    """
+
+    def __init__(self, rules=None, sink=None, callback=None):
+        self.rules_by_sensor = {}
+        self.sink = sink
+        self.callback = callback
+        for rule in rules or []:
+            self.add_rule(rule)
+
+    def add_rule(self, rule):
+        if isinstance(rule, str):
+            rule = parse_alert_rule(rule)
+        self.rules_by_sensor.setdefault(rule.sensor, []).append(rule)
+        return rule
+
+    def evaluate(self, sensor, value, now=None):
+        """측정값 하나를 평가하고, 발생한 이벤트 목록을 반환함"""
+        rules = self.rules_by_sensor.get(sensor)
+        if not rules or not isinstance(value, (int, float)):
+            return []
+        if now is None:
+            now = time.monotonic()
+        events = []
+        for rule in rules:
+            state = rule.evaluate(value, now)
+            if state is None:
+                continue
+            event = {
+                'timestamp': time.time(),
+                'rule': rule.name,
+                'sensor': sensor,
+                'state': state,
+                'value': value,
+            }
+            events.append(event)
+            if self.sink is not None:
+                self.sink.write(event)
+            if self.callback is not None:
+                self.callback(event)
+        return events
+
+    def evaluate_sample(self, values, now=None):
+        """{센서: 값} 사전 전체를 평가함"""
+        if now is None:
+            now = time.monotonic()
+        events = []
+        for sensor, value in values.items():
+            events.extend(self.evaluate(sensor, value, now))
+        return events
+
+    def active_alerts(self):
+        return [rule.name for rules in self.rules_by_sensor.values() for rule in rules if rule.active]
+
+
+class MissionComputer:
+    def __init__(self, sink=None):
         # 환경 값 초기화
         self.env_values = {
             'mars_base_internal_temperature': None,
@@ -12,35 +634,57 @@ class MissionComputer:
             'mars_base_internal_co2': None,
             'mars_base_internal_oxygen': None
         }
-        # DummySensor 인스턴스 ds
-        self.ds = DummySensor()
+        # DummySensor 인스턴스 ds (로그 파일을 여는 비용이 있으므로 처음 읽을 때 생성)
+        self._ds = None
+        # 비동기 수집 엔진: 기본으로 ds를 5초마다 읽고, add_sensor_source()로 센서를 더 추가할 수 있음
+        self.engine = AsyncAcquisitionEngine([SensorSource('ds', self.read_dummy_sensor, period=5.0)])
+        # 5분 평균 등 창 단위 통계 (창을 추가하면 1분, 1시간 등도 동시에 계산)
+        self.aggregator = StreamingWindowAggregator([TumblingWindow(300)])
+        # JSON 출력 대상 (표준 출력, NDJSON 파일, UNIX 소켓 등 write(data)를 가진 객체)
+        self.sink = sink if sink is not None else StdoutSink()
+        # 경보 규칙 엔진 (add_alert_rule()로 규칙 추가, 이벤트는 JSON 출력 대상에 기록)
+        self.alert_engine = AlertEngine(sink=self.sink)
+
+    @property
+    def ds(self):
+        if self._ds is None:
+            self._ds = DummySensor()
+        return self._ds
+
+    def read_dummy_sensor(self):
+        """DummySensor의 값을 새로 생성하고 사전의 복사본을 반환함 (스레드에서 실행됨)"""
+        self.ds.set_env()
+        return dict(self.ds.get_env())
+
+    def add_sensor_source(self, name, read, period=5.0, timeout=None):
+        """
+        수집 엔진에 센서를 추가함. read가 사전을 반환하면 env_values에 반영되고,
+        그 밖의 값은 env_values[name]에 저장됨.
+        """
+        self.engine.add_source(SensorSource(name, read, period, timeout))
+
+    def add_alert_rule(self, rule):
+        """
+        경보 규칙을 추가함. AlertRule 객체 또는 'mars_base_internal_co2 > 0.08 for 30s' 형식의 문자열
+        """
+        return self.alert_engine.add_rule(rule)
 
     def print_json(self, data):
         """
         :param data: JSON 형식으로 출력할 데이터를 담은 딕셔너리
-                     각 키는 문자열이며, 값은 None 또는 숫자 등 임의의 타입일 수 있음
+                     각 키는 문자열이며, 값은 None, 숫자, 문자열 등 임의의 타입일 수 있음
         :type data: dict
         :return: None
         :rtype: None
 
-        - 주어진 딕셔너리(data)를 JSON 형식으로 출력함
-        - 각 키-값 쌍을 순회하면서, 값이 None이면 "null"으로, 그렇지 않으면 문자열로 변환하여 출력
-        - 마지막 항목이 아닌 경우에는 항목 뒤에 쉼표를 붙임
+        - 주어진 딕셔너리(data)를 하나의 JSON 문서로 만들어 self.sink에 한 번에 기록함
+        - 값이 None이면 null, 문자열이면 따옴표로 감싼 JSON 문자열로 변환함
+        - 출력 대상에 기록하지 못해도 수집 루프가 멈추지 않도록 오류만 알림
         """
-        print('{')
-        keys = list(data.keys())
-        for i, key in enumerate(keys):
-            value = data[key]
-            if value is None:
-                value_str = 'null'
-            else:
-                value_str = str(value)
-            # 마지막 항목이 아니면 쉼표 추가
-            if i < len(keys) - 1:
-                print(f'    "{key}": {value_str},')
-            else:
-                print(f'    "{key}": {value_str}')
-        print('}')
+        try:
+            self.sink.write(data)
+        except OSError as e:
+            print(f'경고: JSON 출력에 실패했습니다: {e}', file=sys.stderr)
 
     def get_sensor_data(self):
         """
@@ -48,53 +692,79 @@ class MissionComputer:
         :rtype: None
 
         - "TO EXIT, PRESS CTRL+C" 안내 메시지 출력
-        - DummySensor의 set_env()와 get_env()를 통해 각 센서 데이터 업데이트
-        - 업데이트된 센서 데이터를 self.env_values에 저장하고, 각 센서별 값은 누적 데이터 딕셔너리에 추가
-        - 5초마다 현재 센서 데이터를 JSON 형식으로 출력
-        - 5분이 경과하면, 누적된 데이터를 기반으로 각 센서의 평균값을 계산하여 JSON 형식으로 출력한 후,
-          누적 데이터를 초기화하고 타이머를 재설정
+        - 비동기 수집 엔진이 등록된 센서를 각자의 주기로 동시에 읽어 큐에 넣음 (ds는 5초마다)
+        - 큐에서 꺼낸 센서 데이터를 self.env_values에 저장하고, 창 집계기(self.aggregator)에 반영
+        - 측정값이 들어올 때마다 현재 센서 데이터를 JSON 형식으로 출력
+        - 텀블링 창(기본 5분)이 끝날 때마다 창 안의 각 센서 평균값을 JSON 형식으로 출력
+          (값 목록을 저장하지 않고 개수/합/최소/최대/분산만 유지함)
         - 사용자가 Ctrl+C를 누르면 KeyboardInterrupt가 발생하여 루프를 종료하고,
           "SYSTEM STOPPED..." 메시지를 출력
         """
         print('TO EXIT, PRESS CTRL+C')
-        # 5분(300초)마다 평균을 계산하기 위한 누적 데이터와 타이머 초기화
-        cumulative_data = { key: [] for key in self.env_values }
-        start_time = time.time()
+        try:
+            asyncio.run(self.get_sensor_data_async())
+        except KeyboardInterrupt:
+            print('================== SYSTEM STOPPED... ==================')
+
+    async def get_sensor_data_async(self):
+        """수집 엔진을 시작하고, 공유 큐의 측정값을 소비하는 코루틴"""
+        queue = await self.engine.start()
 
         try:
             while True:
+                reading = await queue.get()
+                if reading['error'] is not None:
+                    print(f"[{reading['source']}] 센서 읽기 실패: {reading['error']}")
+                    continue
+
                 # 센서 데이터 업데이트
-                self.ds.set_env()
-                sensor_data = self.ds.get_env()
+                value = reading['value']
+                sensor_data = value if isinstance(value, dict) else { reading['source']: value }
                 self.env_values.update(sensor_data)
 
-                # 누적 데이터 저장 (각 센서별)
-                for key, value in sensor_data.items():
-                    cumulative_data[key].append(value)
+                # 경보 규칙 평가 (센서별로 색인된 규칙만 O(1)로 평가, 상태가 바뀔 때만 이벤트 기록)
+                self.alert_engine.evaluate_sample(sensor_data)
+
+                # 창 통계 갱신 (O(1), 끝난 텀블링 창이 있으면 반환됨)
+                closed_windows = self.aggregator.add_sample(sensor_data)
 
                 # 센서 데이터 출력 (JSON)
                 self.print_json(self.env_values)
 
-                # 5분마다 누적 데이터의 평균값 계산 및 출력
-                current_time = time.time()
-                if current_time - start_time >= 300:
+                # 끝난 창마다 각 센서의 평균값 출력
+                for window, _, stats in closed_windows:
                     averages = {}
-                    for key, values in cumulative_data.items():
-                        if values:
-                            avg = sum(values) / len(values)
-                            averages[key] = avg
-                        else:
-                            averages[key] = None
-                    print('=============== 5 MINUTE AVERAGE VALUES ===============')
+                    for key in self.env_values:
+                        key_stats = stats.get(key)
+                        averages[key] = key_stats.mean if key_stats and key_stats.count else None
+                    print(f'=============== {window_label(window.length)} AVERAGE VALUES ===============')
                     self.print_json(averages)
-                    # 누적 데이터 및 타이머 초기화
-                    cumulative_data = { key: [] for key in self.env_values }
-                    start_time = current_time
+        finally:
+            await self.engine.stop()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='화성 기지 미션 컴퓨터: 센서 값을 5초마다 JSON으로 출력')
+    parser.add_argument('--output', help='JSON을 표준 출력 대신 NDJSON 파일에 덧붙임')
+    parser.add_argument('--socket', help='JSON을 보낼 UNIX 소켓 경로')
+    parser.add_argument('--alert', action='append', default=[],
+                        help="경보 규칙 (예: 'mars_base_internal_co2 > 0.08 for 30s'), 여러 번 지정 가능")
+    args = parser.parse_args(argv)
+
+    if args.output:
+        sink = NdjsonFileSink(args.output)
+    elif args.socket:
+        sink = UnixSocketSink(args.socket)
+    else:
+        sink = None
+    RunComputer = MissionComputer(sink)
+    try:
+        for rule in args.alert:
+            RunComputer.add_alert_rule(rule)
+        RunComputer.get_sensor_data()
+    finally:
+        # Ctrl+C로 끝나더라도 큐에 남은 문서를 보내고 파일/소켓을 닫음
+        RunComputer.sink.close()
 
-                # 5초 대기
-                time.sleep(5)
-        except KeyboardInterrupt:
-            print('================== SYSTEM STOPPED... ==================')
 
-ms = MissionComputer()
-ms.get_sensor_data()
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,247 @@
 import time, platform, os, psutil
+import threading, collections
 from Week_04.mars_mission_computer import DummySensor
+from Week_05.mars_mission_computer import StdoutSink
+
+
+def _cpu_busy_percent(t1, t2):
+    """두 psutil.cpu_times() 값 사이의 CPU 사용률(%)"""
+    deltas = {field: max(getattr(t2, field) - getattr(t1, field), 0) for field in t2._fields}
+    # guest 시간은 user/nice에 이미 포함되어 있으므로 전체 시간에서 뺌 (psutil.cpu_percent와 같은 방식)
+    deltas.pop('guest', None)
+    deltas.pop('guest_nice', None)
+    total = sum(deltas.values())
+    if total <= 0:
+        return 0.0
+    idle = deltas.get('idle', 0) + deltas.get('iowait', 0)
+    return round((total - idle) / total * 100, 1)
+
+
+class SystemLoadSampler:
+    """
+    백그라운드 스레드에서 일정 주기로 시스템 부하를 측정하여 최근 표본을 원형 버퍼에 보관함.
+
+    - CPU 사용률은 직전 표본(또는 생성 시점)의 cpu_times()와의 차이로 계산하므로 호출자가 1초씩 기다리지 않음
+      (psutil.cpu_percent(interval=None)의 기준점은 스레드별이라 샘플러가 직접 기준점을 보관함)
+    - 표본: 시각, 전체/코어별 CPU 사용률, 메모리 사용률, 디스크/네트워크 누적 카운터
+      (groups로 필요한 묶음만 측정하고, 측정하지 않은 항목은 None)
+    - start()로 스레드를 시작하고 stop()으로 멈춤
+    - latest()는 가장 최근 표본을 즉시 반환함 (아직 표본이 없으면 그 자리에서 하나 측정함)
+    """
+
+    # cpu_times()의 갱신 단위(약 10ms)보다 충분히 긴, CPU 사용률 계산에 필요한 최소 간격(초)
+    MIN_CPU_INTERVAL = 0.1
+
+    # 측정 묶음 -> 표본 항목
+    SAMPLE_GROUPS = {
+        'cpu': ('cpu_percent',),
+        'per_cpu': ('per_cpu_percent',),
+        'memory': ('memory_percent', 'memory_total'),
+        'disk': ('disk_read_bytes', 'disk_write_bytes'),
+        'net': ('net_bytes_sent', 'net_bytes_recv'),
+    }
+    SAMPLE_FIELDS = tuple(field for fields in SAMPLE_GROUPS.values() for field in fields)
+
+    def __init__(self, period=1.0, history=60, groups=None):
+        """
+        :param groups: 측정할 묶음 이름의 집합 (None이면 전체, SAMPLE_GROUPS 참고)
+        """
+        self.period = period
+        self.groups = frozenset(self.SAMPLE_GROUPS) if groups is None else frozenset(groups)
+        self.samples = collections.deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        # 생성 시점을 CPU 사용률의 기준점으로 잡아 둠 (첫 조회가 한 주기를 기다리지 않도록)
+        self._prime_time = time.monotonic()
+        self._last_cpu_times = psutil.cpu_times()
+        self._last_per_cpu_times = psutil.cpu_times(percpu=True)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='SystemLoadSampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.period + 1)
+            self._thread = None
+
+    def _run(self):
+        next_time = time.monotonic()
+        while True:
+            next_time += self.period
+            if self._stop_event.wait(max(next_time - time.monotonic(), 0)):
+                return
+            self.sample()
+
+    def sample(self):
+        """지금 바로 표본 하나를 측정하여 버퍼에 추가하고 반환함 (groups에 없는 묶음은 측정하지 않음)"""
+        groups = self.groups
+        sample = {'timestamp': time.time(), **dict.fromkeys(self.SAMPLE_FIELDS)}
+        # 샘플러 스레드와 latest()가 동시에 측정할 수 있으므로 기준점 갱신은 잠금 안에서 함
+        with self._lock:
+            if 'cpu' in groups:
+                try:
+                    cpu_times = psutil.cpu_times()
+                    sample['cpu_percent'] = _cpu_busy_percent(self._last_cpu_times, cpu_times)
+                    self._last_cpu_times = cpu_times
+                except Exception:
+                    pass
+            if 'per_cpu' in groups:
+                try:
+                    per_cpu_times = psutil.cpu_times(percpu=True)
+                    sample['per_cpu_percent'] = [
+                        _cpu_busy_percent(t1, t2) for t1, t2 in zip(self._last_per_cpu_times, per_cpu_times)
+                    ]
+                    self._last_per_cpu_times = per_cpu_times
+                except Exception:
+                    pass
+        if 'memory' in groups:
+            try:
+                memory = psutil.virtual_memory()
+                sample['memory_percent'] = memory.percent
+                sample['memory_total'] = memory.total
+            except Exception:
+                pass
+        if 'disk' in groups:
+            try:
+                disk = psutil.disk_io_counters()
+                if disk:
+                    sample['disk_read_bytes'] = disk.read_bytes
+                    sample['disk_write_bytes'] = disk.write_bytes
+            except Exception:
+                pass
+        if 'net' in groups:
+            try:
+                net = psutil.net_io_counters()
+                if net:
+                    sample['net_bytes_sent'] = net.bytes_sent
+                    sample['net_bytes_recv'] = net.bytes_recv
+            except Exception:
+                pass
+
+        with self._lock:
+            self.samples.append(sample)
+        return sample
+
+    def latest(self):
+        """
+        가장 최근 표본을 반환함.
+        아직 표본이 없으면 생성 시점의 기준점으로 그 자리에서 하나 측정함
+        (생성 직후라면 MIN_CPU_INTERVAL이 지날 때까지만 기다림).
+        """
+        with self._lock:
+            if self.samples:
+                return self.samples[-1]
+        remaining = self.MIN_CPU_INTERVAL - (time.monotonic() - self._prime_time)
+        if remaining > 0:
+            time.sleep(remaining)
+        return self.sample()
+
+    def history(self):
+        with self._lock:
+            return list(self.samples)
+
+
+def _cpu_type():
+    cpu_type = platform.processor()
+    if not cpu_type:
+        cpu_type = platform.machine()
+    return cpu_type
+
+
+class SystemInfoProvider:
+    """
+    실행 중에 바뀌지 않는 시스템 정보를 항목별로 처음 요청될 때 한 번만 계산하고 캐시함.
+    캐시는 클래스에 두므로 인스턴스(MissionComputer)를 새로 만들어도 프로세스가 끝날 때까지 유지됨.
+    요청되지 않은 항목은 계산하지 않음.
+    """
+
+    # 항목 이름 -> 값을 계산하는 함수 (출력 순서도 이 순서를 따름)
+    FIELDS = {
+        'OS': platform.system,
+        'OS version': platform.version,
+        'CPU Type': _cpu_type,
+        'CPU core count': os.cpu_count,
+        'Memory size(GB)': lambda: round(psutil.virtual_memory().total / (1024 ** 3), 2),
+    }
+
+    _cache = {}
+    _lock = threading.Lock()
+
+    def get(self, fields=None):
+        """
+        :param fields: 필요한 항목 이름의 집합 (None이면 전체)
+        :return: {항목 이름: 값} 사전. 계산에 실패한 항목은 'No info'
+        """
+        info = {}
+        with self._lock:
+            for name, compute in self.FIELDS.items():
+                if fields is not None and name not in fields:
+                    continue
+                if name not in self._cache:
+                    try:
+                        self._cache[name] = compute()
+                    except Exception:
+                        self._cache[name] = 'No info'
+                info[name] = self._cache[name]
+        return info
+
+
+class SettingsProjection:
+    """
+    setting.txt의 각 줄을 출력할 항목 이름으로 보고, 항목 이름 집합으로 변환해 둠.
+    fields()를 호출할 때 파일 수정 시각(mtime)만 확인하여 바뀌었을 때만 다시 읽음.
+    파일이 없거나 읽을 수 없으면 None(전체 항목 출력)을 반환함.
+    """
+
+    def __init__(self, filename='setting.txt'):
+        self.filename = filename
+        self._mtime = None
+        self._names = None
+        self._fields = None
+
+    def _reload_if_changed(self):
+        try:
+            mtime = os.stat(self.filename).st_mtime_ns
+        except OSError:
+            self._mtime, self._names, self._fields = None, None, None
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.filename, 'r', encoding = 'utf-8') as f:
+                names = [line.strip() for line in f if line.strip()]
+        except Exception:
+            names = None
+        self._mtime = mtime
+        self._names = names
+        self._fields = frozenset(names) if names is not None else None
+
+    def names(self):
+        """설정 파일의 항목 이름 목록 (파일 순서)"""
+        self._reload_if_changed()
+        return self._names
+
+    def fields(self):
+        """출력할 항목 이름 집합 (None이면 전체)"""
+        self._reload_if_changed()
+        return self._fields
+
+    def project(self, data):
+        """사전에서 설정에 포함된 항목만 남김"""
+        fields = self.fields()
+        if fields is None:
+            return data
+        return {key: value for key, value in data.items() if key in fields}
 
 
 class MissionComputer:
-    def __init__(self):
+    def __init__(self, sink=None):
         # 환경 값 초기화
         self.env_values = {
             'mars_base_internal_temperature': None,
@@ -13,99 +251,102 @@ class MissionComputer:
             'mars_base_internal_co2': None,
             'mars_base_internal_oxygen': None
         }
-        # DummySensor 인스턴스 ds
-        self.ds = DummySensor()
-        # setting.txt 파일로부터 출력할 항목 읽어오기
+        # DummySensor 인스턴스 ds (로그 파일을 여는 비용이 있으므로 처음 읽을 때 생성)
+        self._ds = None
+        # setting.txt 파일로부터 출력할 항목 읽어오기 (파일이 바뀌면 다음 보고 때 다시 읽음)
+        self.settings_projection = SettingsProjection('setting.txt')
         self.settings = self.read_settings()
+        # 변하지 않는 시스템 정보는 요청된 항목만 한 번 계산하여 캐시
+        self.info_provider = SystemInfoProvider()
+        # JSON 출력 대상 (표준 출력, NDJSON 파일, UNIX 소켓 등 write(data)를 가진 객체)
+        self.sink = sink if sink is not None else StdoutSink()
+        # 시스템 부하는 백그라운드 스레드가 주기적으로 측정하고, 조회 시에는 최근 값을 바로 사용
+        # (스레드는 첫 부하 조회 때 시작하고 close()에서 멈춤, CPU 기준점은 생성할 때 잡아 둠)
+        # setting.txt에 있는 부하 항목에 필요한 묶음만 측정함
+        self.load_sampler = SystemLoadSampler(groups=self.load_groups(self.settings_projection.fields()))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def close(self):
+        """부하 샘플러 스레드를 멈추고, 센서를 만들었다면 남은 로그를 기록하고 닫음"""
+        self.load_sampler.stop()
+        if self._ds is not None:
+            self._ds.close()
+
+    @property
+    def ds(self):
+        if self._ds is None:
+            self._ds = DummySensor()
+        return self._ds
 
     def read_settings(self):
         """
         setting.txt 파일을 읽고 각 줄의 항목을 리스트로 반환함.
         파일이 없거나 읽기에 실패하면 None을 반환함.
         """
-        try:
-            with open('setting.txt', 'r', encoding = 'utf-8') as f:
-                lines = f.readlines()
-                settings = [line.strip() for line in lines if line.strip()]
-                return settings
-        except Exception:
-            return None
+        return self.settings_projection.names()
 
     def get_mission_computer_info(self):
-        # 미션 컴퓨터 시스템 정보를 가져와 JSON 형식으로 출력
-        info = {}
-        try:
-            info['OS'] = platform.system()
-        except Exception:
-            info['OS'] = 'No info'
-
-        try:
-            info['OS version'] = platform.version()
-        except Exception:
-            info['OS version'] = 'No info'
+        # 미션 컴퓨터 시스템 정보를 가져와 JSON 형식으로 출력 (setting.txt에 있는 항목만 계산)
+        info = self.info_provider.get(self.settings_projection.fields())
+        self.print_json(info)
 
-        try:
-            cpu_type = platform.processor()
-            if not cpu_type:
-                cpu_type = platform.machine()
-            info['CPU Type'] = cpu_type
-        except Exception:
-            info['CPU Type'] = 'No info'
-        
-        try:
-            info['CPU core count'] = os.cpu_count()
-        except Exception:
-            info['CPU core count'] = 'No info'
-        
-        try:
-            memory_bytes = psutil.virtual_memory().total
-            info['Memory size(GB)'] = round(memory_bytes / (1024 ** 3), 2)
-        except Exception:
-            info['Memory size(GB)'] = 'No info'
 
-        self.print_json(info)
+    # 부하 항목 이름 -> (샘플러의 측정 묶음, 표본의 항목 이름)
+    LOAD_FIELDS = {
+        'Real-time CPU usage(%)': ('cpu', 'cpu_percent'),
+        'Real-time Memory usage(%)': ('memory', 'memory_percent'),
+        'Real-time per-core CPU usage(%)': ('per_cpu', 'per_cpu_percent'),
+        'Disk read bytes': ('disk', 'disk_read_bytes'),
+        'Disk write bytes': ('disk', 'disk_write_bytes'),
+        'Network bytes sent': ('net', 'net_bytes_sent'),
+        'Network bytes received': ('net', 'net_bytes_recv'),
+    }
+    DEFAULT_LOAD_FIELDS = ('Real-time CPU usage(%)', 'Real-time Memory usage(%)')
 
+    @classmethod
+    def load_groups(cls, fields):
+        """출력할 항목 이름 집합(None이면 기본 부하 항목)에 필요한 샘플러 측정 묶음"""
+        if fields is None:
+            fields = cls.DEFAULT_LOAD_FIELDS
+        return {group for name, (group, _) in cls.LOAD_FIELDS.items() if name in fields}
 
     def get_mission_computer_load(self):
-        load_info = {}
-        try:
-            load_info['Real-time CPU usage(%)'] = psutil.cpu_percent(interval = 1) # 1초 간격 CPU 사용률
-        except Exception:
-            load_info['Real-time CPU usage(%)'] = 'No info'
+        # 백그라운드 샘플러의 최근 표본을 사용하므로 1초씩 기다리지 않음
+        fields = self.settings_projection.fields()
+        # setting.txt가 바뀌어 새 항목이 필요해지면 다음 표본부터 그 묶음도 측정함
+        self.load_sampler.groups = frozenset(self.load_groups(fields))
+        self.load_sampler.start()
+        sample = self.load_sampler.latest()
+        if fields is None:
+            fields = self.DEFAULT_LOAD_FIELDS
 
-        try:
-            load_info['Real-time Memory usage(%)'] = psutil.virtual_memory().percent
-        except Exception:
-                load_info['Real-time Memory usage(%)'] = 'No info'
+        load_info = {}
+        for name, (_, key) in self.LOAD_FIELDS.items():
+            if name not in fields:
+                continue
+            value = sample[key]
+            load_info[name] = value if value is not None else 'No info'
 
         self.print_json(load_info)
 
     def print_json(self, data):
         """
         :param data: JSON 형식으로 출력할 데이터를 담은 딕셔너리
-                     각 키는 문자열이며, 값은 None 또는 숫자 등 임의의 타입일 수 있음
+                     각 키는 문자열이며, 값은 None, 숫자, 문자열 등 임의의 타입일 수 있음
         :type data: dict
         :return: None
         :rtype: None
 
-        - 주어진 딕셔너리(data)를 JSON 형식으로 출력함
-        - 각 키-값 쌍을 순회하면서, 값이 None이면 "null"으로, 그렇지 않으면 문자열로 변환하여 출력
-        - 마지막 항목이 아닌 경우에는 항목 뒤에 쉼표를 붙임
+        - 주어진 딕셔너리(data)를 하나의 JSON 문서로 만들어 self.sink에 한 번에 기록함
+        - 값이 None이면 null, 문자열이면 따옴표로 감싼 JSON 문자열로 변환함
         """
-        print('{')
-        keys = list(data.keys())
-        for i, key in enumerate(keys):
-            value = data[key]
-            if value is None:
-                value_str = 'null'
-            else:
-                value_str = str(value)
-            # 마지막 항목이 아니면 쉼표 추가
-            if i < len(keys) - 1:
-                print(f'    "{key}": {value_str},')
-            else:
-                print(f'    "{key}": {value_str}')
-        print('}')
+        self.sink.write(data)
 
     def get_sensor_data(self):
         """
@@ -161,8 +402,14 @@ class MissionComputer:
         except KeyboardInterrupt:
             print('================== SYSTEM STOPPED... ==================')
 
-runComputer = MissionComputer()
-print('============= MISSION COMPUTER INFO =============')
-runComputer.get_mission_computer_info()
-print('============= MISSION COMPUTER LOAD =============')
-runComputer.get_mission_computer_load()
\ No newline at end of file
+
+def main():
+    with MissionComputer() as runComputer:
+        print('============= MISSION COMPUTER INFO =============')
+        runComputer.get_mission_computer_info()
+        print('============= MISSION COMPUTER LOAD =============')
+        runComputer.get_mission_computer_load()
+
+
+if __name__ == '__main__':
+    main()
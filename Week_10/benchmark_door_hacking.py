@@ -0,0 +1,243 @@
+import os
+import io
+import json
+import time
+import zlib
+import struct
+import string
+import argparse
+import tempfile
+import contextlib
+
+from door_hacking import (
+    _CRC_TABLE,
+    ZipCryptoVerifier,
+    MaskAttack,
+    unlock_zip_parallel,
+)
+
+# --chunk-size를 주지 않으면 가장 많은 프로세스 수 기준으로 프로세스마다 이만큼의 구간이 돌아가도록 나눔
+CHUNKS_PER_PROCESS = 16
+# 구간이 너무 작으면 큐 왕복 비용이 커지므로 두는 최소 구간 크기
+MIN_CHUNK_SIZE = 1024
+
+# 고정된 DOS 수정 시각/날짜 (2025-06-01 12:00:00)
+_DOS_TIME = (12 << 11) | (0 << 5) | 0
+_DOS_DATE = ((2025 - 1980) << 9) | (6 << 5) | 1
+
+
+def zipcrypto_encrypt(password: bytes, plain_bytes: bytes) -> bytes:
+    """
+    ZipCrypto(PKWARE 전통 암호화) 방식으로 plain_bytes를 암호화함.
+    zipfile 모듈은 암호화된 ZIP을 만들 수 없으므로 벤치마크용으로 직접 구현함.
+    """
+    crc_table = _CRC_TABLE
+    k0, k1, k2 = 0x12345678, 0x23456789, 0x34567890
+    for c in password:
+        k0 = (k0 >> 8) ^ crc_table[(k0 ^ c) & 0xff]
+        k1 = ((k1 + (k0 & 0xff)) * 134775813 + 1) & 0xffffffff
+        k2 = (k2 >> 8) ^ crc_table[(k2 ^ (k1 >> 24)) & 0xff]
+
+    encrypted = bytearray(len(plain_bytes))
+    for i, plain in enumerate(plain_bytes):
+        temp = k2 | 2
+        encrypted[i] = plain ^ (((temp * (temp ^ 1)) >> 8) & 0xff)
+        k0 = (k0 >> 8) ^ crc_table[(k0 ^ plain) & 0xff]
+        k1 = ((k1 + (k0 & 0xff)) * 134775813 + 1) & 0xffffffff
+        k2 = (k2 >> 8) ^ crc_table[(k2 ^ (k1 >> 24)) & 0xff]
+    return bytes(encrypted)
+
+
+def write_zipcrypto_archive(zip_filename: str, password: str, members: dict, compress: bool = True) -> None:
+    """
+    주어진 암호로 모든 멤버를 ZipCrypto 암호화한 ZIP 파일을 만듦.
+
+    Args:
+        zip_filename (str): 만들 ZIP 파일 경로
+        password (str): 암호
+        members (dict): {멤버 이름: 내용(bytes)}
+        compress (bool, optional): True면 deflate 압축, False면 무압축(stored)
+    """
+    password_bytes = password.encode('utf-8')
+    local_parts = []
+    central_parts = []
+    offset = 0
+
+    for name, data in members.items():
+        name_bytes = name.encode('utf-8')
+        crc = zlib.crc32(data) & 0xffffffff
+        if compress:
+            compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+            payload = compressor.compress(data) + compressor.flush()
+            method = 8
+        else:
+            payload = data
+            method = 0
+
+        # 12바이트 암호화 헤더: 임의의 11바이트 + CRC 상위 바이트(check byte)
+        encryption_header = os.urandom(11) + bytes([crc >> 24])
+        encrypted = zipcrypto_encrypt(password_bytes, encryption_header + payload)
+
+        local_header = struct.pack(
+            '<4s5H3L2H', b'PK\x03\x04', 20, 0x1, method, _DOS_TIME, _DOS_DATE,
+            crc, len(encrypted), len(data), len(name_bytes), 0,
+        )
+        central_header = struct.pack(
+            '<4s6H3L5H2L', b'PK\x01\x02', 20, 20, 0x1, method, _DOS_TIME, _DOS_DATE,
+            crc, len(encrypted), len(data), len(name_bytes), 0, 0, 0, 0, 0, offset,
+        )
+        local_parts.append(local_header + name_bytes + encrypted)
+        central_parts.append(central_header + name_bytes)
+        offset += len(local_parts[-1])
+
+    central_directory = b''.join(central_parts)
+    end_record = struct.pack(
+        '<4s4H2LH', b'PK\x05\x06', 0, 0, len(members), len(members),
+        len(central_directory), offset, 0,
+    )
+    with open(zip_filename, 'wb') as f:
+        f.write(b''.join(local_parts) + central_directory + end_record)
+
+
+def benchmark_verifier(zip_filename: str, attack, num_candidates: int) -> float:
+    """
+    프로세스 생성 비용 없이 한 프로세스에서 verifier.verify()만 반복하여 초당 후보 수를 잼.
+    """
+    verifier = ZipCryptoVerifier(zip_filename)
+    num_candidates = min(num_candidates, attack.size)
+    start_time = time.perf_counter()
+    for password_bytes in attack.iter_range(0, num_candidates):
+        verifier.verify(password_bytes)
+    elapsed = time.perf_counter() - start_time
+    return num_candidates / elapsed if elapsed > 0 else 0.0
+
+
+def benchmark_crack(zip_filename: str, attack, num_processes: int, chunk_size: int | None) -> dict:
+    """
+    unlock_zip_parallel을 조용히 실행하고, 실행 통계 JSON에서 속도와 소요 시간을 읽어 옴.
+    """
+    work_dir = os.path.dirname(zip_filename)
+    stats_filename = os.path.join(work_dir, f'stats_{num_processes}.json')
+    checkpoint_filename = os.path.join(work_dir, f'checkpoint_{num_processes}')
+    output_filename = os.path.join(work_dir, f'found_{num_processes}.txt')
+
+    start_time = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        found_password = unlock_zip_parallel(
+            zip_filename, output_filename, attack, chunk_size,
+            checkpoint_filename=checkpoint_filename,
+            report_interval=3600,
+            stats_filename=stats_filename,
+            num_processes=num_processes,
+            extract=False,
+        )
+    wall_time = time.perf_counter() - start_time
+
+    with open(stats_filename, 'r', encoding='utf-8') as f:
+        stats = json.load(f)
+    for filename in (checkpoint_filename, stats_filename, output_filename):
+        with contextlib.suppress(OSError):
+            os.remove(filename)
+
+    search_seconds = stats['search_seconds']
+    return {
+        'processes': num_processes,
+        'found_password': found_password,
+        'time_to_find': round(wall_time, 3),
+        # 프로세스 생성과 검증기 준비에 걸린 시간 (대입 시작 전까지)
+        'startup_seconds': round(wall_time - search_seconds, 3) if search_seconds is not None else None,
+        'attempts': stats['total_attempts'],
+        # 시작 비용을 뺀 대입 속도
+        'rate': stats['search_rate'],
+        'wall_rate': stats['average_rate'],
+    }
+
+
+def benchmark_chunk_size(attack, process_counts: list) -> int:
+    """
+    가장 많은 프로세스 수에서도 모든 워커가 여러 구간을 나누어 받도록 구간 크기를 정함.
+    구간이 몇 개뿐이면 남는 워커가 놀고, 키스페이스 중간의 암호를 항상 첫 구간의 워커가 찾게 되어 비교가 무의미해짐.
+    """
+    return max(attack.size // (max(process_counts) * CHUNKS_PER_PROCESS), MIN_CHUNK_SIZE)
+
+
+def run_benchmarks(mask: str, positions: list, member_sizes: list, process_counts: list,
+                   chunk_size: int | None, verifier_candidates: int) -> list:
+    """
+    멤버 크기와 암호 위치(키스페이스 비율)의 조합마다 암호화 ZIP을 만들고,
+    각 프로세스 수로 암호 대입을 실행하여 결과 목록을 반환함.
+    """
+    attack = MaskAttack(mask)
+    if chunk_size is None:
+        chunk_size = benchmark_chunk_size(attack, process_counts)
+    results = []
+
+    for member_size in member_sizes:
+        member_data = (string.ascii_letters * (member_size // len(string.ascii_letters) + 1))[:member_size].encode()
+        for position in positions:
+            target_index = min(int(attack.size * position), attack.size - 1)
+            password = attack.engine.candidate_at(target_index)
+
+            with tempfile.TemporaryDirectory() as work_dir:
+                zip_filename = os.path.join(work_dir, 'bench.zip')
+                write_zipcrypto_archive(zip_filename, password, {'secret.txt': member_data})
+                verifier_rate = benchmark_verifier(zip_filename, attack, verifier_candidates)
+                runs = [benchmark_crack(zip_filename, attack, n, chunk_size) for n in process_counts]
+
+            base_run = runs[0]
+            for run in runs:
+                # 가장 적은 프로세스 수 대비 코어당 처리 속도 비율
+                run['scaling_efficiency'] = round(
+                    (run['rate'] / run['processes']) / (base_run['rate'] / base_run['processes']), 3
+                ) if base_run['rate'] else None
+                run['correct'] = run['found_password'] == password
+
+            results.append({
+                'mask': mask,
+                'member_size': member_size,
+                'position': position,
+                'target_index': target_index,
+                'password': password,
+                'verifier_rate': round(verifier_rate, 1),
+                'chunk_size': chunk_size,
+                'runs': runs,
+            })
+    return results
+
+
+def print_results(results: list) -> None:
+    print(f"{'멤버 크기':>10} {'위치':>6} {'암호':>10} {'검증기/s':>12} "
+          f"{'프로세스':>8} {'후보/s':>12} {'효율':>6} {'시작(초)':>9} {'소요(초)':>9} {'정답':>4}")
+    for result in results:
+        for run in result['runs']:
+            efficiency = f"{run['scaling_efficiency']:.2f}" if run['scaling_efficiency'] is not None else '-'
+            startup = f"{run['startup_seconds']:.2f}" if run['startup_seconds'] is not None else '-'
+            print(f"{result['member_size']:>10} {result['position']:>6.2f} {result['password']:>10} "
+                  f"{result['verifier_rate']:>12,.0f} {run['processes']:>8} {run['rate']:>12,.0f} "
+                  f"{efficiency:>6} {startup:>9} {run['time_to_find']:>9.2f} {'O' if run['correct'] else 'X':>4}")
+
+
+# --- main ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='door_hacking 암호 대입 벤치마크 (합성 ZipCrypto 아카이브 사용)')
+    parser.add_argument('--mask', default='?l?l?l?d?d', help="키스페이스를 정하는 마스크 (기본값: '?l?l?l?d?d')")
+    parser.add_argument('--positions', type=float, nargs='+', default=[0.1, 0.5, 0.9],
+                        help='암호를 둘 키스페이스 상의 위치 비율 (0 ~ 1)')
+    parser.add_argument('--member-sizes', type=int, nargs='+', default=[16, 65536], help='암호화할 멤버 크기(바이트)')
+    parser.add_argument('--processes', type=int, nargs='+', default=None,
+                        help='비교할 프로세스 수 목록 (기본값: 1과 CPU 코어 수)')
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help=f'한 작업 구간의 크기 (기본값: 키스페이스 / (최대 프로세스 수 x {CHUNKS_PER_PROCESS}))')
+    parser.add_argument('--verifier-candidates', type=int, default=50_000, help='단일 프로세스 검증기 측정에 쓸 후보 수')
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일')
+    args = parser.parse_args()
+
+    process_counts = args.processes or sorted({1, os.cpu_count() or 1})
+    benchmark_results = run_benchmarks(args.mask, args.positions, args.member_sizes, process_counts,
+                                       args.chunk_size, args.verifier_candidates)
+    print_results(benchmark_results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(benchmark_results, f, ensure_ascii=False, indent=2)
+        print(f"\n벤치마크 결과를 '{args.json}' 파일에 저장했습니다.")
@@ -1,82 +1,808 @@
 import zipfile
-import itertools
 import time
 import string
 import os
+import io
+import json
+import queue
+import struct
+import signal
 import multiprocessing 
 
+
+# --- ZipCrypto(PKWARE 전통 암호화) 키 스케줄에 사용하는 CRC32 테이블 ---
+def _make_crc_table() -> list:
+    table = []
+    for n in range(256):
+        c = n
+        for _ in range(8):
+            if c & 1:
+                c = (c >> 1) ^ 0xEDB88320
+            else:
+                c >>= 1
+        table.append(c)
+    return table
+
+_CRC_TABLE = _make_crc_table()
+_LOCAL_HEADER_STRUCT = struct.Struct('<4s5H3L2H') # ZIP 로컬 파일 헤더 (30바이트)
+
+
+class ZipCryptoVerifier:
+    """
+    ZIP 파일을 한 번만 메모리에 읽어 두고, 후보 암호를 디스크 접근 없이 검증함.
+
+    가장 작은 암호화 멤버의 12바이트 암호화 헤더만 복호화하여 마지막 바이트(check byte)를
+    비교하므로, 틀린 암호는 대부분(255/256) 여기서 바로 걸러짐.
+    헤더 검사를 통과한 드문 후보만 메모리 상의 ZipFile로 전체 복호화 + CRC 검사를 수행함.
+    """
+
+    def __init__(self, zip_filename: str):
+        """
+        Args:
+            zip_filename (str): 검사할 ZIP 파일 경로
+
+        Raises:
+            OSError: 파일을 읽을 수 없는 경우
+            zipfile.BadZipFile: ZIP 형식이 아닌 경우
+            ValueError: ZipCrypto로 암호화된 멤버가 없는 경우
+        """
+        with open(zip_filename, 'rb') as f:
+            self.archive_bytes = f.read()
+        self.zip_file = zipfile.ZipFile(io.BytesIO(self.archive_bytes), 'r')
+
+        # 암호화된 멤버 중 압축 크기가 가장 작은 멤버를 검증 대상으로 선택
+        encrypted_members = [
+            info for info in self.zip_file.infolist()
+            if info.flag_bits & 0x1 and info.compress_type in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+        ]
+        if not encrypted_members:
+            raise ValueError(f"'{zip_filename}'에 ZipCrypto로 암호화된 멤버가 없습니다.")
+        self.member = min(encrypted_members, key=lambda info: info.compress_size)
+
+        # 로컬 파일 헤더를 직접 해석하여 암호화 헤더 위치와 check byte를 구함
+        offset = self.member.header_offset
+        fields = _LOCAL_HEADER_STRUCT.unpack_from(self.archive_bytes, offset)
+        mod_time, name_length, extra_length = fields[4], fields[9], fields[10]
+        data_start = offset + _LOCAL_HEADER_STRUCT.size + name_length + extra_length
+        self.encryption_header = self.archive_bytes[data_start:data_start + 12]
+
+        if self.member.flag_bits & 0x8:
+            # 데이터 디스크립터를 쓰는 경우 CRC 대신 수정 시각의 상위 바이트를 check byte로 사용
+            self.check_byte = (mod_time >> 8) & 0xff
+        else:
+            self.check_byte = (self.member.CRC >> 24) & 0xff
+
+    def check_header(self, password_bytes: bytes) -> bool:
+        """
+        암호로 키를 초기화하고 12바이트 암호화 헤더를 복호화하여 check byte를 비교함.
+
+        Returns:
+            bool: check byte가 일치하면 True (실제 암호일 가능성 있음), 아니면 False
+        """
+        crc_table = _CRC_TABLE
+        k0, k1, k2 = 0x12345678, 0x23456789, 0x34567890
+
+        for c in password_bytes:
+            k0 = (k0 >> 8) ^ crc_table[(k0 ^ c) & 0xff]
+            k1 = ((k1 + (k0 & 0xff)) * 134775813 + 1) & 0xffffffff
+            k2 = (k2 >> 8) ^ crc_table[(k2 ^ (k1 >> 24)) & 0xff]
+
+        plain = 0
+        for c in self.encryption_header:
+            temp = k2 | 2
+            plain = c ^ (((temp * (temp ^ 1)) >> 8) & 0xff)
+            k0 = (k0 >> 8) ^ crc_table[(k0 ^ plain) & 0xff]
+            k1 = ((k1 + (k0 & 0xff)) * 134775813 + 1) & 0xffffffff
+            k2 = (k2 >> 8) ^ crc_table[(k2 ^ (k1 >> 24)) & 0xff]
+
+        return plain == self.check_byte
+
+    def verify(self, password_bytes: bytes) -> bool:
+        """
+        헤더 검사를 통과한 경우에만 멤버 전체를 메모리에서 복호화하고 CRC를 확인함.
+
+        Returns:
+            bool: 올바른 암호이면 True, 아니면 False
+        """
+        if not self.check_header(password_bytes):
+            return False
+        try:
+            self.zip_file.read(self.member, pwd=bytes(password_bytes))
+            return True
+        except (RuntimeError, zipfile.BadZipFile, zipfile.zlib.error):
+            return False
+
+
+class CandidateEngine:
+    """
+    키스페이스 순번(index)을 재사용되는 bytearray 암호로 바로 변환하는 후보 생성기.
+
+    자리마다 사용할 문자셋(bytes)을 따로 가지며, 순번 0이 모든 자리의 첫 문자이고
+    맨 오른쪽 자리가 가장 빠르게 바뀜 (itertools.product와 같은 순서).
+    다음 후보는 주행거리계(odometer)처럼 바이트 값을 올려 만들기 때문에
+    후보마다 튜플, 문자열, bytes 객체를 새로 만들지 않음.
+    """
+
+    def __init__(self, position_charsets: list):
+        """
+        Args:
+            position_charsets (list): 각 자리에서 사용할 문자셋 목록 (str 또는 bytes)
+        """
+        self.position_charsets = [
+            charset.encode('utf-8') if isinstance(charset, str) else bytes(charset)
+            for charset in position_charsets
+        ]
+        if any(not charset for charset in self.position_charsets):
+            raise ValueError("빈 문자셋은 사용할 수 없습니다.")
+        self.length = len(self.position_charsets)
+        self.size = 1
+        for charset in self.position_charsets:
+            self.size *= len(charset)
+        self.digits = [0] * self.length
+        self.password = bytearray(charset[0] for charset in self.position_charsets)
+
+    @classmethod
+    def brute_force(cls, charset: str, password_length: int) -> 'CandidateEngine':
+        """모든 자리에 같은 문자셋을 쓰는 전수 대입용 엔진을 만듦."""
+        return cls([charset] * password_length)
+
+    def seek(self, index: int) -> bytearray:
+        """
+        index번째 후보로 이동하고, 그 후보를 담은 bytearray를 반환함.
+
+        Raises:
+            IndexError: index가 키스페이스 범위를 벗어난 경우
+        """
+        if not 0 <= index < self.size:
+            raise IndexError(f"index {index}는 키스페이스 범위(0 ~ {self.size - 1})를 벗어났습니다.")
+        for pos in range(self.length - 1, -1, -1):
+            charset = self.position_charsets[pos]
+            index, digit = divmod(index, len(charset))
+            self.digits[pos] = digit
+            self.password[pos] = charset[digit]
+        return self.password
+
+    def candidate_at(self, index: int) -> str:
+        """index번째 후보를 문자열로 반환함 (현재 위치는 바뀜)."""
+        return self.seek(index).decode('utf-8', errors='replace')
+
+    def iter_range(self, range_start: int, range_end: int):
+        """
+        [range_start, range_end) 구간의 후보를 순서대로 내보냄.
+
+        매번 같은 bytearray 객체를 내보내므로, 값을 보관하려면 호출자가 bytes()로 복사해야 함.
+        """
+        range_end = min(range_end, self.size)
+        if range_start >= range_end:
+            return
+        password = self.seek(range_start)
+        if self.length == 0:
+            yield password
+            return
+
+        digits = self.digits
+        charsets = self.position_charsets
+        last = self.length - 1
+        last_charset = charsets[last]
+        remaining = range_end - range_start
+
+        while True:
+            # 마지막 자리는 문자셋을 그대로 순회하며 바이트 하나만 바꿈
+            for byte in last_charset[digits[last]:digits[last] + remaining]:
+                password[last] = byte
+                yield password
+            remaining -= len(last_charset) - digits[last]
+            if remaining <= 0:
+                return
+            digits[last] = 0
+
+            # 앞자리 올림(carry) 처리
+            pos = last - 1
+            while pos >= 0:
+                digit = digits[pos] + 1
+                if digit < len(charsets[pos]):
+                    digits[pos] = digit
+                    password[pos] = charsets[pos][digit]
+                    break
+                digits[pos] = 0
+                password[pos] = charsets[pos][0]
+                pos -= 1
+            if pos < 0:
+                return # 키스페이스 끝
+
+
+# --- 공격 모드 ---
+# 모든 공격 모드는 size(순번 단위의 키스페이스 크기), iter_range(start, end), keyspace_info()를 제공하며,
+# 같은 구간 스케줄러와 워커 풀에서 그대로 사용됨.
+
+MASK_CHARSETS = {
+    'l': string.ascii_lowercase,
+    'u': string.ascii_uppercase,
+    'd': string.digits,
+    's': ' ' + string.punctuation,
+    'a': string.ascii_lowercase + string.ascii_uppercase + string.digits + ' ' + string.punctuation,
+    'h': '0123456789abcdef',
+    'H': '0123456789ABCDEF',
+}
+
+
+def parse_mask(mask: str, custom_charsets: dict | None = None) -> list:
+    """
+    '?l?l?d?d?d?d' 형식의 마스크를 자리별 문자셋 목록으로 변환함.
+
+    ?l 소문자, ?u 대문자, ?d 숫자, ?s 특수문자, ?a 전체, ?h/?H 16진수,
+    ?1 ~ ?4 사용자 정의 문자셋, ?? 물음표 문자, 그 밖의 문자는 그 자리에 고정됨.
+
+    Raises:
+        ValueError: 알 수 없는 마스크 기호가 있는 경우
+    """
+    custom_charsets = custom_charsets or {}
+    position_charsets = []
+    i = 0
+    while i < len(mask):
+        char = mask[i]
+        if char != '?':
+            position_charsets.append(char)
+            i += 1
+            continue
+        if i + 1 >= len(mask):
+            raise ValueError(f"마스크 '{mask}'가 '?'로 끝납니다.")
+        symbol = mask[i + 1]
+        if symbol == '?':
+            position_charsets.append('?')
+        elif symbol in MASK_CHARSETS:
+            position_charsets.append(MASK_CHARSETS[symbol])
+        elif symbol in custom_charsets:
+            position_charsets.append(custom_charsets[symbol])
+        else:
+            raise ValueError(f"알 수 없는 마스크 기호입니다: ?{symbol}")
+        i += 2
+    return position_charsets
+
+
+class BruteForceAttack:
+    """
+    하나의 문자셋으로 min_length부터 max_length까지 길이를 늘려 가며 전수 대입함.
+    """
+
+    default_chunk_size = 1_000_000
+    counts_candidates = True # 순번 하나가 후보 하나에 대응함
+
+    def __init__(self, charset: str, min_length: int, max_length: int | None = None):
+        if max_length is None:
+            max_length = min_length
+        if min_length < 1 or max_length < min_length:
+            raise ValueError(f"잘못된 길이 범위입니다: {min_length} ~ {max_length}")
+        self.charset = charset
+        self.min_length = min_length
+        self.max_length = max_length
+        self.engines = [CandidateEngine.brute_force(charset, length) for length in range(min_length, max_length + 1)]
+        self.size = sum(engine.size for engine in self.engines)
+
+    def keyspace_info(self) -> dict:
+        return {'mode': 'brute_force', 'charset': self.charset,
+                'min_length': self.min_length, 'max_length': self.max_length}
+
+    def describe(self) -> str:
+        if self.min_length == self.max_length:
+            length_text = f'{self.min_length}자리'
+        else:
+            length_text = f'{self.min_length}~{self.max_length}자리'
+        return f"전수 대입: 문자셋 {len(self.charset)}종, {length_text}, 총 {self.size:,}개 조합"
+
+    def iter_range(self, range_start: int, range_end: int):
+        offset = 0
+        for engine in self.engines:
+            # 길이별 키스페이스를 이어 붙인 순번에서 이 엔진에 해당하는 부분만 순회
+            local_start = max(range_start - offset, 0)
+            local_end = min(range_end - offset, engine.size)
+            if local_start < local_end:
+                yield from engine.iter_range(local_start, local_end)
+            offset += engine.size
+            if offset >= range_end:
+                return
+
+
+class MaskAttack:
+    """
+    '?l?l?d?d?d?d'처럼 자리마다 문자셋을 지정하는 마스크 대입.
+    """
+
+    default_chunk_size = 1_000_000
+    counts_candidates = True
+
+    def __init__(self, mask: str, custom_charsets: dict | None = None):
+        self.mask = mask
+        self.custom_charsets = dict(custom_charsets or {})
+        self.engine = CandidateEngine(parse_mask(mask, self.custom_charsets))
+        self.size = self.engine.size
+
+    def keyspace_info(self) -> dict:
+        return {'mode': 'mask', 'mask': self.mask, 'custom_charsets': self.custom_charsets}
+
+    def describe(self) -> str:
+        return f"마스크 대입: '{self.mask}', 총 {self.size:,}개 조합"
+
+    def iter_range(self, range_start: int, range_end: int):
+        return self.engine.iter_range(range_start, range_end)
+
+
+def iter_wordlist_range(wordlist_filename: str, range_start: int, range_end: int):
+    """
+    단어 목록 파일에서 첫 바이트가 [range_start, range_end) 안에 있는 줄만 읽어 내보냄.
+
+    파일 전체를 메모리에 올리지 않고, 구간 경계에 걸친 줄은 시작 바이트가 속한 구간에서만 처리됨.
+    """
+    with open(wordlist_filename, 'rb') as f:
+        if range_start > 0:
+            # 바로 앞 바이트부터 한 줄을 버리면 range_start 이후에 시작하는 첫 줄로 이동함
+            f.seek(range_start - 1)
+            position = range_start - 1 + len(f.readline())
+        else:
+            position = 0
+        while position < range_end:
+            line = f.readline()
+            if not line:
+                return
+            position += len(line)
+            word = line.rstrip(b'\r\n')
+            if word:
+                yield word
+
+
+class WordlistAttack:
+    """
+    단어 목록 파일을 디스크에서 스트리밍하며 대입함. 순번 단위는 파일의 바이트 위치임.
+    """
+
+    default_chunk_size = 1 << 20 # 1MB씩 나누어 처리
+    counts_candidates = False # 순번은 바이트 위치이므로 후보 수와 다름
+
+    def __init__(self, wordlist_filename: str):
+        self.wordlist_filename = wordlist_filename
+        stat = os.stat(wordlist_filename)
+        self.size = stat.st_size
+        self.mtime = int(stat.st_mtime)
+
+    def keyspace_info(self) -> dict:
+        return {'mode': 'wordlist', 'wordlist': os.path.abspath(self.wordlist_filename),
+                'file_size': self.size, 'mtime': self.mtime}
+
+    def describe(self) -> str:
+        return f"사전 대입: '{self.wordlist_filename}' ({self.size:,}바이트)"
+
+    def iter_range(self, range_start: int, range_end: int):
+        return iter_wordlist_range(self.wordlist_filename, range_start, range_end)
+
+
+def compile_rule(rule: str) -> list:
+    """
+    단어 변형 규칙 문자열을 (연산, 인자) 목록으로 변환함 (hashcat 규칙의 일부).
+
+    ':' 그대로, 'l' 소문자, 'u' 대문자, 'c' 첫 글자만 대문자, 't' 대소문자 반전,
+    'r' 뒤집기, 'd' 두 번 반복, '$X' 끝에 X 추가, '^X' 앞에 X 추가, 'sXY' X를 Y로 치환.
+
+    Raises:
+        ValueError: 알 수 없는 규칙이거나 인자가 부족한 경우
+    """
+    argument_counts = {':': 0, 'l': 0, 'u': 0, 'c': 0, 't': 0, 'r': 0, 'd': 0, '$': 1, '^': 1, 's': 2}
+    operations = []
+    i = 0
+    while i < len(rule):
+        op = rule[i]
+        if op == ' ':
+            i += 1
+            continue
+        if op not in argument_counts:
+            raise ValueError(f"알 수 없는 규칙 연산입니다: '{op}' (규칙: '{rule}')")
+        count = argument_counts[op]
+        argument = rule[i + 1:i + 1 + count].encode('utf-8')
+        if len(argument) < count:
+            raise ValueError(f"규칙 '{rule}'의 '{op}' 연산에 인자가 부족합니다.")
+        operations.append((op, argument))
+        i += 1 + count
+    return operations
+
+
+def apply_rule(word: bytes, operations: list) -> bytes:
+    """compile_rule()로 만든 연산 목록을 단어에 차례로 적용함."""
+    for op, argument in operations:
+        if op == 'l':
+            word = word.lower()
+        elif op == 'u':
+            word = word.upper()
+        elif op == 'c':
+            word = word[:1].upper() + word[1:].lower()
+        elif op == 't':
+            word = word.swapcase()
+        elif op == 'r':
+            word = word[::-1]
+        elif op == 'd':
+            word = word + word
+        elif op == '$':
+            word = word + argument
+        elif op == '^':
+            word = argument + word
+        elif op == 's':
+            word = word.replace(argument[:1], argument[1:])
+    return word
+
+
+class HybridAttack:
+    """
+    단어 목록 + 변형 규칙(+ 선택적으로 뒤에 붙일 마스크)을 조합하여 대입함.
+    순번 단위는 단어 목록 파일의 바이트 위치이며, 단어마다 모든 규칙과 마스크 조합을 시도함.
+    """
+
+    default_chunk_size = 64 * 1024
+    counts_candidates = False
+
+    def __init__(self, wordlist_filename: str, rules: list | None = None, append_mask: str | None = None,
+                 custom_charsets: dict | None = None):
+        self.wordlist_filename = wordlist_filename
+        self.rules = list(rules) if rules else [':']
+        self.compiled_rules = [compile_rule(rule) for rule in self.rules]
+        self.append_mask = append_mask
+        self.custom_charsets = dict(custom_charsets or {})
+        self.mask_engine = CandidateEngine(parse_mask(append_mask, self.custom_charsets)) if append_mask else None
+        stat = os.stat(wordlist_filename)
+        self.size = stat.st_size
+        self.mtime = int(stat.st_mtime)
+
+    def keyspace_info(self) -> dict:
+        return {'mode': 'hybrid', 'wordlist': os.path.abspath(self.wordlist_filename),
+                'file_size': self.size, 'mtime': self.mtime, 'rules': self.rules,
+                'append_mask': self.append_mask, 'custom_charsets': self.custom_charsets}
+
+    def describe(self) -> str:
+        text = f"하이브리드 대입: '{self.wordlist_filename}' ({self.size:,}바이트) x 규칙 {len(self.rules)}개"
+        if self.mask_engine:
+            text += f" x 마스크 '{self.append_mask}' ({self.mask_engine.size:,}개)"
+        return text
+
+    def iter_range(self, range_start: int, range_end: int):
+        candidate = bytearray()
+        for word in iter_wordlist_range(self.wordlist_filename, range_start, range_end):
+            for operations in self.compiled_rules:
+                transformed = apply_rule(word, operations)
+                if self.mask_engine is None:
+                    yield transformed
+                    continue
+                prefix_length = len(transformed)
+                candidate[:] = transformed
+                for suffix in self.mask_engine.iter_range(0, self.mask_engine.size):
+                    candidate[prefix_length:] = suffix
+                    yield candidate
+
+
+class KeyspaceCheckpoint:
+    """
+    키스페이스를 고정 크기의 순번 구간(chunk)으로 나누고, 완료된 구간을 체크포인트 파일에 기록함.
+
+    파일의 첫 줄은 키스페이스 정보(JSON), 이후 각 줄은 완료된 chunk 번호임.
+    줄 단위로 덧붙여 쓰기 때문에 중간에 중단되어도 이미 기록된 구간은 유지되고,
+    키스페이스 정보가 다르면 기존 기록은 무시하고 새로 시작함.
+    """
+
+    def __init__(self, checkpoint_filename: str, keyspace_info: dict, total_size: int, chunk_size: int):
+        self.checkpoint_filename = checkpoint_filename
+        self.keyspace_info = dict(keyspace_info, total_size=total_size, chunk_size=chunk_size)
+        self.total_size = total_size
+        self.chunk_size = chunk_size
+        self.num_chunks = (total_size + chunk_size - 1) // chunk_size
+        self.completed_chunks = set()
+        self._file = None
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.checkpoint_filename, 'r', encoding='utf-8') as f:
+                first_line = f.readline()
+                if not first_line or json.loads(first_line) != self.keyspace_info:
+                    return # 다른 작업의 체크포인트이면 무시
+                for line in f:
+                    line = line.strip()
+                    if line.isdigit():
+                        self.completed_chunks.add(int(line))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"경고: 체크포인트 파일 '{self.checkpoint_filename}'을 읽을 수 없어 처음부터 시작합니다: {e}")
+            self.completed_chunks.clear()
+
+    def open(self) -> None:
+        """체크포인트 파일을 기록용으로 열고, 새 작업이면 헤더를 작성함."""
+        if self.completed_chunks:
+            self._file = open(self.checkpoint_filename, 'a', encoding='utf-8')
+        else:
+            self._file = open(self.checkpoint_filename, 'w', encoding='utf-8')
+            self._file.write(json.dumps(self.keyspace_info) + '\n')
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self) -> None:
+        """작업이 끝나 더 이상 필요 없는 체크포인트 파일을 삭제함."""
+        self.close()
+        try:
+            os.remove(self.checkpoint_filename)
+        except OSError:
+            pass
+
+    def pending_ranges(self) -> list:
+        """아직 완료되지 않은 (chunk 번호, 시작 순번, 끝 순번) 목록을 반환함."""
+        ranges = []
+        for chunk_index in range(self.num_chunks):
+            if chunk_index in self.completed_chunks:
+                continue
+            start = chunk_index * self.chunk_size
+            end = min(start + self.chunk_size, self.total_size)
+            ranges.append((chunk_index, start, end))
+        return ranges
+
+    def mark_done(self, chunk_index: int) -> None:
+        if chunk_index in self.completed_chunks:
+            return
+        self.completed_chunks.add(chunk_index)
+        if self._file is not None:
+            self._file.write(f'{chunk_index}\n')
+            self._file.flush()
+
+    def completed_size(self) -> int:
+        """완료된 구간에 포함된 후보 수."""
+        done = len(self.completed_chunks) * self.chunk_size
+        last_chunk = self.num_chunks - 1
+        if last_chunk in self.completed_chunks:
+            done -= self.num_chunks * self.chunk_size - self.total_size
+        return done
+
+
+STOP_CHECK_BATCH = 512 # 워커가 공유 중지 플래그를 확인하는 간격 (후보 수)
+TELEMETRY_BATCH = 4096 # 워커가 공유 메모리의 시도 횟수를 갱신하는 간격 (STOP_CHECK_BATCH의 배수)
+
+
+def _format_rate(rate: float) -> str:
+    if rate >= 1_000_000:
+        return f'{rate / 1_000_000:.2f}M'
+    if rate >= 1_000:
+        return f'{rate / 1_000:.1f}k'
+    return f'{rate:.0f}'
+
+
+def _format_duration(seconds: float | None) -> str:
+    if seconds is None:
+        return '계산 중'
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f'{hours:d}:{minutes:02d}:{seconds:02d}'
+
+
+class CrackTelemetry:
+    """
+    워커별 시도 횟수를 공유 메모리(multiprocessing.Array)로 모아 처리 속도, 진행률, 남은 시간을 계산함.
+
+    워커는 TELEMETRY_BATCH개마다 자기 칸에 누적 시도 횟수를 덮어쓰기만 하므로 락이나 IPC 비용이 없음.
+    """
+
+    def __init__(self, num_workers: int, attack, initial_covered: int):
+        """
+        Args:
+            num_workers (int): 워커 프로세스 수
+            attack: 진행 중인 공격 모드 (size, counts_candidates 사용)
+            initial_covered (int): 체크포인트로 이미 끝낸 순번 수
+        """
+        self.attempt_counters = multiprocessing.Array('Q', num_workers, lock=False)
+        # 워커가 검증기 준비를 마치고 대입을 시작한 시각 (epoch 초, 0이면 아직 시작 전)
+        self.worker_start_times = multiprocessing.Array('d', num_workers, lock=False)
+        self.num_workers = num_workers
+        self.keyspace_size = attack.size
+        self.counts_candidates = attack.counts_candidates
+        self.initial_covered = initial_covered
+        self.start_time = time.monotonic()
+        self.last_time = self.start_time
+        self.last_counts = [0] * num_workers
+
+    def covered_units(self, completed_size: int) -> int:
+        """
+        지금까지 처리한 순번 수를 추정함.
+        후보 수 = 순번 수인 모드는 진행 중인 구간의 시도 횟수까지, 그 밖의 모드는 완료된 구간만 반영함.
+        """
+        if self.counts_candidates:
+            return min(self.initial_covered + sum(self.attempt_counters), self.keyspace_size)
+        return completed_size
+
+    def snapshot(self, completed_size: int) -> dict:
+        """직전 스냅샷 이후의 워커별 속도와 전체 진행률, 남은 시간을 계산함."""
+        now = time.monotonic()
+        counts = list(self.attempt_counters)
+        interval = max(now - self.last_time, 1e-9)
+        worker_rates = [(count - last) / interval for count, last in zip(counts, self.last_counts)]
+        self.last_time = now
+        self.last_counts = counts
+
+        elapsed = max(now - self.start_time, 1e-9)
+        covered = self.covered_units(completed_size)
+        covered_this_run = covered - self.initial_covered
+        remaining = self.keyspace_size - covered
+        eta = remaining / (covered_this_run / elapsed) if covered_this_run > 0 else None
+        # 프로세스 생성과 검증기 준비 시간을 뺀, 첫 워커가 대입을 시작한 뒤의 시간과 속도
+        started = [start for start in self.worker_start_times if start > 0]
+        search_elapsed = max(time.time() - min(started), 1e-9) if started else None
+        return {
+            'elapsed': elapsed,
+            'search_elapsed': search_elapsed,
+            'total_attempts': sum(counts),
+            'rate': sum(worker_rates),
+            'average_rate': sum(counts) / elapsed,
+            'search_rate': sum(counts) / search_elapsed if search_elapsed else 0.0,
+            'worker_attempts': counts,
+            'worker_rates': worker_rates,
+            'covered': covered,
+            'percent': covered / self.keyspace_size * 100 if self.keyspace_size else 100.0,
+            'eta': eta,
+        }
+
+    def format_status(self, snap: dict, alive_workers: list) -> str:
+        """진행 상황 한 줄 요약. 살아 있지만 이번 간격 동안 시도가 없던 워커는 '!'로 표시함."""
+        worker_texts = []
+        for worker_id, rate in enumerate(snap['worker_rates']):
+            stalled = '!' if alive_workers[worker_id] and rate == 0 else ''
+            worker_texts.append(f'{worker_id}:{_format_rate(rate)}{stalled}')
+        return (f"[진행] {snap['percent']:6.2f}% | {_format_rate(snap['rate'])}/s "
+                f"(누적 {snap['total_attempts']:,}회) | 남은 시간 {_format_duration(snap['eta'])} | "
+                f"워커 {' '.join(worker_texts)}")
+
+    def write_summary(self, summary_filename: str, snap: dict, extra: dict) -> None:
+        """최종 통계를 JSON 파일로 저장함."""
+        summary = {
+            'elapsed_seconds': round(snap['elapsed'], 3),
+            'total_attempts': snap['total_attempts'],
+            'average_rate': round(snap['average_rate'], 1),
+            'search_seconds': round(snap['search_elapsed'], 3) if snap['search_elapsed'] else None,
+            'search_rate': round(snap['search_rate'], 1),
+            'num_workers': self.num_workers,
+            'worker_attempts': snap['worker_attempts'],
+            'worker_average_rates': [round(count / snap['elapsed'], 1) for count in snap['worker_attempts']],
+            'keyspace_size': self.keyspace_size,
+            'covered': snap['covered'],
+            'percent_covered': round(snap['percent'], 4),
+        }
+        summary.update(extra)
+        try:
+            with open(summary_filename, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+            print(f"실행 통계를 '{summary_filename}' 파일에 저장했습니다.")
+        except OSError as e:
+            print(f"경고: 실행 통계 파일 '{summary_filename}'을 저장할 수 없습니다: {e}")
+
+
 def worker_crack_password(
     zip_filename: str,
-    characters_to_try: list, 
-    base_characters: str,   
-    password_length: int,
-    stop_event: multiprocessing.Event, 
-    result_queue: multiprocessing.Queue 
+    attack,
+    task_queue: multiprocessing.Queue,
+    stop_flag, 
+    result_queue: multiprocessing.Queue,
+    worker_id: int = 0,
+    attempt_counters=None,
+    worker_start_times=None
 ) -> None:
+    """
+    작업 큐에서 (chunk 번호, 시작 순번, 끝 순번) 구간을 하나씩 가져와 attack의 후보를 대입함.
 
-    if password_length == 1: # 첫 문자가 곧 전체 암호인 경우
-        password_generator = ((char,) for char in characters_to_try)
-    elif password_length > 1:
+    구간을 끝까지 시도하면 result_queue에 ('done', chunk 번호)를,
+    암호를 찾으면 ('found', 암호 bytes)를 넣음. 큐에서 None을 받으면 종료함.
+    탐색 중에는 디스크에 아무것도 쓰지 않으며, 압축 해제는 부모 프로세스가 한 번만 수행함.
 
-        def generate_passwords_for_worker():         
-            remaining_length = password_length - 1
-            if remaining_length < 0:
-                return
+    stop_flag는 공유 메모리 값(multiprocessing.RawValue)으로, STOP_CHECK_BATCH개마다 읽어
+    Event.is_set()의 락/IPC 비용 없이 수 밀리초 안에 멈춤.
+    attempt_counters가 주어지면 TELEMETRY_BATCH개마다 attempt_counters[worker_id]에 누적 시도 횟수를 기록함.
+    worker_start_times가 주어지면 검증기 준비를 마친 시각을 worker_start_times[worker_id]에 기록함.
+    """
+    # Ctrl+C는 부모 프로세스가 처리하고 stop_flag로 워커를 멈춤
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
 
-            if remaining_length == 0: 
-                 for first_char in characters_to_try:
-                    if stop_event.is_set(): return
-                    yield (first_char,)
-            else:
-                for first_char in characters_to_try:
-                    if stop_event.is_set(): return
-                    
-                    for p_tuple in itertools.product(base_characters, repeat=remaining_length):
-                        if stop_event.is_set(): return
-                        yield (first_char,) + p_tuple
-        
-        password_generator = generate_passwords_for_worker()
-
-    else: 
+    if attempt_counters is None:
+        attempt_counters = [0] * (worker_id + 1)
+
+    # ZIP 파일은 워커마다 한 번만 읽고, 이후 후보 검증은 메모리에서만 수행
+    try:
+        verifier = ZipCryptoVerifier(zip_filename)
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        print(f"오류: '{zip_filename}' 파일을 검증용으로 읽을 수 없습니다: {e}")
         return
+    if worker_start_times is not None:
+        worker_start_times[worker_id] = time.time()
 
     attempts_in_worker = 0
-    for pw_tuple in password_generator:
-        if stop_event.is_set():
-            break # 다른 워커가 암호를 찾았으면 중단
+    while not stop_flag.value:
+        task = task_queue.get()
+        if task is None:
+            break # 더 이상 남은 구간이 없음
+        chunk_index, range_start, range_end = task
 
-        attempts_in_worker +=1
-        current_pw_candidate = "".join(pw_tuple)
-        password_bytes = current_pw_candidate.encode('utf-8')
+        for password_bytes in attack.iter_range(range_start, range_end):
+            attempts_in_worker += 1
+            if not attempts_in_worker % STOP_CHECK_BATCH:
+                if stop_flag.value:
+                    # 다른 워커가 암호를 찾았으면 중단 (이 구간은 완료로 기록하지 않음)
+                    attempt_counters[worker_id] = attempts_in_worker
+                    return
+                if not attempts_in_worker % TELEMETRY_BATCH:
+                    attempt_counters[worker_id] = attempts_in_worker
 
-        try:
-            with zipfile.ZipFile(zip_filename, 'r') as zf:
-                # zf.setpassword(password_bytes)
-                # if zf.testzip() is None: 
-                #    
-                #     if not stop_event.is_set(): # 중복 보고 방지
-                #         result_queue.put(current_pw_candidate)
-                #         stop_event.set()
-                #     break
-                
-                zf.extractall(pwd=password_bytes)
+            if not verifier.verify(password_bytes):
+                continue # 잘못된 암호, 다음 시도 계속
+
+            attempt_counters[worker_id] = attempts_in_worker
+            if not stop_flag.value: # 다른 프로세스가 먼저 결과를 넣지 않았는지 확인
+                stop_flag.value = 1 # 다른 모든 프로세스에게 중지 신호
+                result_queue.put(('found', bytes(password_bytes)))
+            return
+
+        attempt_counters[worker_id] = attempts_in_worker
+        result_queue.put(('done', chunk_index))
+
+
+def extract_with_password(zip_filename: str, password_bytes: bytes, extract_dir: str | None = None) -> bool:
+    """
+    암호를 다시 한 번 확인한 뒤, ZIP 파일 전체를 한 번만 압축 해제함.
+
+    Returns:
+        bool: 압축 해제에 성공하면 True, 아니면 False
+    """
+    try:
+        if not ZipCryptoVerifier(zip_filename).verify(password_bytes):
+            print("오류: 보고된 암호가 검증을 통과하지 못해 압축을 해제하지 않습니다.")
+            return False
+        with zipfile.ZipFile(zip_filename, 'r') as zf:
+            zf.extractall(path=extract_dir, pwd=password_bytes)
+        return True
+    except (OSError, ValueError, RuntimeError, zipfile.BadZipFile, zipfile.zlib.error) as e:
+        print(f"오류: 암호는 확인되었지만 압축 해제에 실패했습니다: {e}")
+        return False
 
-                if not stop_event.is_set(): # 다른 프로세스가 먼저 결과를 넣지 않았는지 확인
-                    result_queue.put(current_pw_candidate)
-                    stop_event.set() # 다른 모든 프로세스에게 중지 신호
-                break 
-        except (RuntimeError, zipfile.BadZipFile, zipfile.zlib.error):
-            pass # 잘못된 암호, 다음 시도 계속
-        except Exception:
-            # 예상치 못한 오류는 일단 무시하고 계속 (실제로는 로깅하거나 처리 필요)
-            pass
-        
 
-def unlock_zip_parallel(zip_filename: str, password_output_filename: str) -> str | None:
+def unlock_zip_parallel(
+    zip_filename: str,
+    password_output_filename: str,
+    attack=None,
+    chunk_size: int | None = None,
+    checkpoint_filename: str | None = None,
+    report_interval: float = 5.0,
+    stats_filename: str | None = None,
+    num_processes: int | None = None,
+    extract: bool = True,
+    stop_timeout: float = 0.5
+) -> str | None:
+    """
+    attack(공격 모드)의 키스페이스를 구간으로 나누어 여러 프로세스에서 병렬로 대입함.
+
+    Args:
+        zip_filename (str): 암호를 찾을 ZIP 파일 경로
+        password_output_filename (str): 찾은 암호를 저장할 파일 경로
+        attack (optional): BruteForceAttack, MaskAttack, WordlistAttack, HybridAttack 중 하나.
+            기본값은 소문자+숫자 6자리 전수 대입
+        chunk_size (int, optional): 한 구간의 크기. 기본값은 공격 모드별 default_chunk_size
+        checkpoint_filename (str, optional): 체크포인트 파일 경로. 기본값은 '<zip_filename>.checkpoint'
+        report_interval (float, optional): 진행 상황(속도, 진행률, 남은 시간)을 출력하는 간격(초)
+        stats_filename (str, optional): 최종 실행 통계 JSON 파일 경로. 기본값은 '<zip_filename>.stats.json'
+        num_processes (int, optional): 워커 프로세스 수. 기본값은 os.cpu_count()
+        extract (bool, optional): 암호를 찾으면 현재 디렉터리에 압축을 해제할지 여부
+        stop_timeout (float, optional): 중지 신호 후 워커가 스스로 끝나기를 기다리는 최대 시간(초)
+
+    Returns:
+        str | None: 찾은 암호, 찾지 못했으면 None
+    """
     print(f"'{zip_filename}' 파일의 암호 해독을 병렬로 시작합니다...")
     
-    possible_characters = string.ascii_lowercase + string.digits
-    password_length = 6 
+    if attack is None:
+        attack = BruteForceAttack(string.ascii_lowercase + string.digits, 6)
+    if chunk_size is None:
+        chunk_size = attack.default_chunk_size
     
     start_time = time.time()
     found_password = None
@@ -87,74 +813,130 @@ def unlock_zip_parallel(zip_filename: str, password_output_filename: str) -> str
     
     print(f"암호 대입 시작 시간: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start_time))}")
 
-    num_processes = os.cpu_count()
+    if num_processes is None:
+        num_processes = os.cpu_count()
     if num_processes is None or num_processes < 1:
         num_processes = 1 
     print(f"사용할 프로세스 수: {num_processes}")
 
-    stop_event = multiprocessing.Event()
+    # 키스페이스를 chunk_size 크기의 순번 구간으로 나누고, 이전 실행에서 끝낸 구간은 건너뜀
+    total_expected_combinations = attack.size
+    if checkpoint_filename is None:
+        checkpoint_filename = zip_filename + '.checkpoint'
+    checkpoint = KeyspaceCheckpoint(
+        checkpoint_filename,
+        dict(attack.keyspace_info(), zip=os.path.basename(zip_filename)),
+        total_expected_combinations,
+        chunk_size,
+    )
+    pending_ranges = checkpoint.pending_ranges()
+    print(f"{attack.describe()} (병렬)")
+    if checkpoint.completed_chunks:
+        print(f"체크포인트에서 완료된 {checkpoint.completed_size():,}개 순번을 건너뜁니다 "
+              f"({len(pending_ranges):,}/{checkpoint.num_chunks:,} 구간 남음).")
+
+    try:
+        checkpoint.open()
+    except OSError as e:
+        print(f"경고: 체크포인트 파일 '{checkpoint_filename}'에 기록할 수 없습니다: {e}")
+
+    telemetry = CrackTelemetry(num_processes, attack, checkpoint.completed_size())
+
+    stop_flag = multiprocessing.RawValue('b', 0) # 락 없는 공유 중지 플래그
+    task_queue = multiprocessing.Queue()
     result_queue = multiprocessing.Queue()
     processes = []
 
-    chars_per_process = [[] for _ in range(num_processes)]
-    for i, char_val in enumerate(possible_characters):
-        chars_per_process[i % num_processes].append(char_val)
-    
-    total_expected_combinations = len(possible_characters) ** password_length
-    print(f"총 {total_expected_combinations:,}개의 암호 조합을 시도합니다 (병렬).")
-
+    # 모든 구간을 공유 큐에 넣고, 워커 수만큼 종료 신호(None)를 추가
+    for task in pending_ranges:
+        task_queue.put(task)
+    for _ in range(num_processes):
+        task_queue.put(None)
 
     for i in range(num_processes):
-        if not chars_per_process[i]: 
-            continue
-        
-        # 각 프로세스에 worker_crack_password 함수와 인자들을 전달
+        # 각 프로세스는 공유 큐에서 구간을 꺼내 가므로, 먼저 끝난 워커가 남은 구간을 계속 가져감
         process = multiprocessing.Process(
             target=worker_crack_password, 
             args=(
                 zip_filename, 
-                chars_per_process[i], # 이 워커가 담당할 첫 번째 문자들
-                possible_characters,  # 나머지 자리에 사용될 전체 문자셋
-                password_length,      # 전체 암호 길이
-                stop_event, 
+                attack,               # 후보를 만들어 낼 공격 모드
+                task_queue,
+                stop_flag, 
                 result_queue,
+                i,                    # 워커 번호 (공유 카운터의 칸)
+                telemetry.attempt_counters,
+                telemetry.worker_start_times, # 대입 시작 시각 (시작 비용을 뺀 속도 계산용)
             )
         )
         processes.append(process)
         process.start()
-    
-    while any(p.is_alive() for p in processes) and not stop_event.is_set():
-        try:
-            # 큐에서 결과를 기다림 (타임아웃 설정 가능)
-            found_password = result_queue.get(timeout=1) # 1초마다 체크
-            if found_password:
-                stop_event.set() # 다른 프로세스들에게 중지 신호
-                break
-        except multiprocessing.queues.Empty: # 파이썬 버전에 따라 queue.Empty
-            # 1초 동안 결과가 없으면 계속 대기 (또는 다른 작업 수행)
-            pass 
-        except Exception: # 다른 예상치 못한 큐 관련 오류 처리
-            break
 
+    found_password_bytes = None
+
+    def handle_message(message) -> None:
+        nonlocal found_password, found_password_bytes
+        kind, value = message
+        if kind == 'done':
+            checkpoint.mark_done(value)
+        elif kind == 'found' and not found_password:
+            found_password = value.decode('utf-8', errors='replace')
+            found_password_bytes = value
+
+    next_report_time = time.monotonic() + report_interval
+    try:
+        while any(p.is_alive() for p in processes) and not found_password:
+            try:
+                # 큐에서 결과를 기다림
+                handle_message(result_queue.get(timeout=1)) # 1초마다 체크
+            except queue.Empty:
+                # 1초 동안 결과가 없으면 계속 대기
+                pass 
+
+            # 일정 간격으로 전체/워커별 속도, 진행률, 남은 시간 출력
+            if time.monotonic() >= next_report_time:
+                snap = telemetry.snapshot(checkpoint.completed_size())
+                print(telemetry.format_status(snap, [p.is_alive() for p in processes]))
+                next_report_time += report_interval
+    except KeyboardInterrupt:
+        print("\n사용자에 의해 중단되었습니다. 완료된 구간은 체크포인트에 저장되어 있습니다.")
+
+    stop_flag.value = 1 # 다른 프로세스들에게 중지 신호
+    # 워커는 STOP_CHECK_BATCH개 안에 스스로 멈추므로 짧게 기다리고, 남은 프로세스만 강제 종료
+    stop_deadline = time.monotonic() + stop_timeout
+    for process in processes:
+        process.join(timeout=max(stop_deadline - time.monotonic(), 0))
     for process in processes:
         if process.is_alive():
             process.terminate() 
-        process.join(timeout=1) 
-
-    if not found_password:
-        while not result_queue.empty():
-            pw = result_queue.get_nowait()
-            if pw: 
-                found_password = pw
-                break
+            process.join(timeout=1) 
+
+    # 종료 전에 큐에 남은 완료 보고와 결과를 모두 반영
+    while True:
+        try:
+            handle_message(result_queue.get_nowait())
+        except (queue.Empty, OSError, ValueError):
+            break
+    checkpoint.close()
                 
     end_time = time.time()
     total_elapsed_time = end_time - start_time
+
+    if stats_filename is None:
+        stats_filename = zip_filename + '.stats.json'
+    telemetry.write_summary(stats_filename, telemetry.snapshot(checkpoint.completed_size()), {
+        'zip': os.path.basename(zip_filename),
+        'attack': attack.keyspace_info(),
+        'found': found_password is not None,
+        'exhausted': found_password is None and len(checkpoint.completed_chunks) >= checkpoint.num_chunks,
+    })
     
 
     if found_password:
+        checkpoint.remove() # 암호를 찾았으므로 체크포인트는 더 이상 필요 없음
         print(f"\n@@@@ 암호 발견 @@@: {found_password}")
         print(f"총 경과 시간: {total_elapsed_time:.2f}초")
+        if extract and extract_with_password(zip_filename, found_password_bytes):
+            print(f"'{zip_filename}' 파일의 압축을 해제했습니다.")
         try:
             with open(password_output_filename, 'w') as f:
                 f.write(found_password)
@@ -162,13 +944,53 @@ def unlock_zip_parallel(zip_filename: str, password_output_filename: str) -> str
         except IOError:
             print(f"오류: '{password_output_filename}' 파일에 암호를 저장할 수 없습니다.")
         return found_password
+    elif len(checkpoint.completed_chunks) < checkpoint.num_chunks:
+        print(f"\n암호를 찾지 못한 채 중단되었습니다. 다시 실행하면 남은 구간부터 이어서 시도합니다. "
+              f"총 경과 시간: {total_elapsed_time:.2f}초")
+        return None
     else:
         print(f"\n모든 조합을 시도했지만 암호를 찾지 못했습니다. 총 경과 시간: {total_elapsed_time:.2f}초")
         return None
 
+def build_attack(args):
+    """명령줄 인자로부터 공격 모드 객체를 만듦."""
+    custom_charsets = {str(i + 1): charset for i, charset in enumerate(args.custom_charset or [])}
+    if args.wordlist and (args.rule or args.append_mask):
+        return HybridAttack(args.wordlist, args.rule, args.append_mask, custom_charsets)
+    if args.wordlist:
+        return WordlistAttack(args.wordlist)
+    if args.mask:
+        return MaskAttack(args.mask, custom_charsets)
+    max_length = args.max_length if args.max_length is not None else args.min_length
+    return BruteForceAttack(args.charset, args.min_length, max_length)
+
+
 # --- main ---
 if __name__ == "__main__":    
-    TARGET_ZIP_FILE = "emergency_storage_key.zip" 
-    PASSWORD_FILE = "password.txt"
-    
-    unlock_zip_parallel(TARGET_ZIP_FILE, PASSWORD_FILE)
+    import argparse
+
+    parser = argparse.ArgumentParser(description='ZIP 파일 암호 병렬 대입')
+    parser.add_argument('zip_file', nargs='?', default='emergency_storage_key.zip', help='암호를 찾을 ZIP 파일')
+    parser.add_argument('--output', default='password.txt', help='찾은 암호를 저장할 파일')
+    parser.add_argument('--charset', default=string.ascii_lowercase + string.digits, help='전수 대입 문자셋')
+    parser.add_argument('--min-length', type=int, default=6, help='전수 대입 최소 길이')
+    parser.add_argument('--max-length', type=int, default=None, help='전수 대입 최대 길이 (기본값: 최소 길이)')
+    parser.add_argument('--mask', help="마스크 대입 (예: '?l?l?d?d?d?d')")
+    parser.add_argument('--custom-charset', action='append', help='마스크의 ?1 ~ ?4에 대응하는 사용자 정의 문자셋')
+    parser.add_argument('--wordlist', help='사전 대입에 사용할 단어 목록 파일')
+    parser.add_argument('--rule', action='append', help="단어 변형 규칙 (예: 'c', '$1', 'sa@'), 여러 번 지정 가능")
+    parser.add_argument('--append-mask', help="사전 단어 뒤에 붙일 마스크 (예: '?d?d')")
+    parser.add_argument('--chunk-size', type=int, default=None, help='한 작업 구간의 크기')
+    parser.add_argument('--report-interval', type=float, default=5.0, help='진행 상황 출력 간격(초)')
+    parser.add_argument('--processes', type=int, default=None, help='워커 프로세스 수 (기본값: CPU 코어 수)')
+    parser.add_argument('--no-extract', action='store_true', help='암호를 찾아도 압축을 해제하지 않음')
+    args = parser.parse_args()
+
+    try:
+        selected_attack = build_attack(args)
+    except (OSError, ValueError) as e:
+        print(f"오류: 공격 모드를 설정할 수 없습니다: {e}")
+    else:
+        unlock_zip_parallel(args.zip_file, args.output, selected_attack, args.chunk_size,
+                            report_interval=args.report_interval, num_processes=args.processes,
+                            extract=not args.no_extract)
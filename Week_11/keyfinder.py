@@ -1,5 +1,11 @@
 import os
+import csv
+import json
+import string
+import hashlib
 import zipfile
+import contextlib
+import multiprocessing
 
 
 def load_caesar_target_from_zip() -> str | None:
@@ -83,84 +89,422 @@ def load_caesar_target_from_zip() -> str | None:
         return None
 
 
+def _build_decode_tables() -> tuple:
+    """
+    key 0~25 각각에 대한 복호화 변환 테이블을 한 번만 만들어 둠.
+    str.translate용 테이블과 bytes.translate용 256바이트 테이블을 함께 반환함.
+    """
+    lower = string.ascii_lowercase
+    upper = string.ascii_uppercase
+    str_tables = []
+    bytes_tables = []
+    for key in range(26):
+        # 암호문 문자 -> key만큼 앞으로 되돌린 평문 문자
+        plain_lower = lower[-key:] + lower[:-key] if key else lower
+        plain_upper = upper[-key:] + upper[:-key] if key else upper
+        str_tables.append(str.maketrans(lower + upper, plain_lower + plain_upper))
+        bytes_tables.append(bytes.maketrans((lower + upper).encode('ascii'), (plain_lower + plain_upper).encode('ascii')))
+    return str_tables, bytes_tables
+
+_DECODE_TABLES, _DECODE_BYTES_TABLES = _build_decode_tables()
+
+# 이 크기 이상의 텍스트는 UTF-8 바이트로 바꿔 bytes.translate로 처리하는 것이 더 빠름
+LARGE_TEXT_THRESHOLD = 64 * 1024
+
+
 def caesar_cipher_decode(target_text: str, key: int) -> str:
     """
-    :target_text:
-    :key:
-
-    Return:
-        :str:
-    """
-    # 해독된 문자들을 저장할 빈 리스트를 준비 (나중에 "".join())
-    # 입력된 target_text의 각 문자 char에 대해 
-    # a. char 가 대문자라면
-    # a.1. char를 0-25 사이 숫자로 변환
-    # a.2. char를 평문 해석 
-    # a.3. 결과를 알파벳으로 변환
-    # b. char 가 소문자라면 (위 1~3)
-    # c. char가 알파벳이 아니라면 변경하지 않고 그대로 리스트에 추가
-    # 반복 끝나면 결과 리스트 문자열 하나의 문자열로 합쳐서 반환
-
-    decrypted_list = []
-
-    for char_in_text in target_text:
-        if char_in_text.isupper():
-            crypto_numeric = ord(char_in_text) - ord('A')
-            plain_numeric = (crypto_numeric - key + 26) % 26
-            plain_char = chr(plain_numeric + ord('A'))
-            decrypted_list.append(plain_char)
-        
-        elif char_in_text.islower():
-            crypto_numeric = ord(char_in_text) - ord('a')
-            plain_numeric = (crypto_numeric - key + 26) % 26
-            plain_char = chr(plain_numeric + ord('a'))
-            decrypted_list.append(plain_char)
-        
-        else:
-            decrypted_list.append(char_in_text)
+    미리 만들어 둔 변환 테이블로 카이사르 암호문을 한 번에 복호화함.
+    영문 대소문자만 key만큼 되돌리고, 그 밖의 문자는 그대로 둠.
 
-    return "".join(decrypted_list)
+    Args:
+        target_text (str): 암호문
+        key (int): 암호화에 사용된 이동 거리 (0~25, 범위를 벗어나면 26으로 나눈 나머지 사용)
 
+    Returns:
+        str: 복호화된 평문
+    """
+    return target_text.translate(_DECODE_TABLES[key % 26])
 
-# --- main ---
-if __name__ == "__main__":
-    target_text = load_caesar_target_from_zip()
-
-    if target_text:
-        print("#" * 30)
-        print(f"Ciphertext: {target_text}")
-        all_plain_text = {}
-        for key in range(26):
-            plain_text = caesar_cipher_decode(target_text, key)
-            all_plain_text[key] = plain_text
-            print(f"        Key = {key:02d}--> Plaintext: {plain_text}")
-
-    selected_key = -1
+
+def caesar_cipher_decode_bytes(target_bytes: bytes, key: int) -> bytes:
+    """
+    바이트 열(ASCII 또는 UTF-8)을 그대로 복호화함.
+    UTF-8의 멀티바이트 문자는 모두 0x80 이상이라 영문자 바이트와 겹치지 않으므로 안전함.
+
+    Args:
+        target_bytes (bytes): 암호문 바이트
+        key (int): 암호화에 사용된 이동 거리
+
+    Returns:
+        bytes: 복호화된 평문 바이트
+    """
+    return target_bytes.translate(_DECODE_BYTES_TABLES[key % 26])
+
+
+def caesar_decode_all(target_text: str) -> dict:
+    """
+    key 0~25 전체에 대해 복호화한 평문을 {key: 평문} 사전으로 반환함.
+    큰 텍스트는 한 번만 UTF-8로 인코딩한 뒤 bytes.translate로 처리함.
+    """
+    if len(target_text) < LARGE_TEXT_THRESHOLD:
+        return {key: caesar_cipher_decode(target_text, key) for key in range(26)}
+
+    target_bytes = target_text.encode('utf-8')
+    return {
+        key: caesar_cipher_decode_bytes(target_bytes, key).decode('utf-8')
+        for key in range(26)
+    }
+
+
+# --- 자동 key 선택 (문자 빈도 + 사전 단어) ---
+
+# 영어 알파벳 a~z의 상대 빈도 (%)
+ENGLISH_LETTER_FREQUENCIES = [
+    8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153, 0.772, 4.025, 2.406,
+    6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074,
+]
+
+# 단어 적중률 계산에 쓰는 기본 영어 단어 목록 (자주 쓰이는 단어 위주)
+COMMON_ENGLISH_WORDS = frozenset("""
+a about after all also an and any are as at be because been but by can come could day do even
+first for from get give go good have he her here him his how i if in into is it its just know
+like look love make man me more most my new no not now of on one only or other our out over people
+say see she so some take than that the their them then there these they think this time to two
+up us use very want was way we well were what when which who will with work would year you your
+mars base mission oxygen help emergency door key password open
+""".split())
+
+SAMPLE_LENGTH_FOR_WORDS = 4096 # 단어 적중률은 앞부분 표본만 복호화하여 계산
+WORD_CHECK_CANDIDATES = 5      # 단어 적중률을 계산할 chi-squared 상위 후보 수
+DEFAULT_MIN_CONFIDENCE = 0.5   # 이보다 신뢰도가 낮으면 사용자에게 key를 물어봄
+
+
+def letter_histogram(target_text: str) -> list:
+    """
+    암호문의 영문자 개수를 대소문자 구분 없이 a~z 26칸 히스토그램으로 셈.
+    str.count는 C 수준에서 동작하므로 글자 단위 파이썬 루프보다 빠름.
+    """
+    folded = target_text.lower()
+    return [folded.count(letter) for letter in string.ascii_lowercase]
+
+
+def chi_squared_scores(histogram: list) -> list:
+    """
+    암호문 히스토그램 하나로 key 0~25 각각의 chi-squared 값을 계산함 (낮을수록 영어에 가까움).
+    key k의 평문 문자 p는 암호문 문자 (p + k) % 26에서 오므로 텍스트를 복호화할 필요가 없음.
+    """
+    total = sum(histogram)
+    if total == 0:
+        return [0.0] * 26
+    expected = [total * freq / 100 for freq in ENGLISH_LETTER_FREQUENCIES]
+    scores = []
+    for key in range(26):
+        score = 0.0
+        for plain_index in range(26):
+            observed = histogram[(plain_index + key) % 26]
+            score += (observed - expected[plain_index]) ** 2 / expected[plain_index]
+        scores.append(score)
+    return scores
+
+
+def word_hit_rate(plain_text: str, words: frozenset) -> float:
+    """평문에서 영문 단어 중 사전에 있는 단어의 비율."""
+    tokens = ''.join(char if char.isalpha() else ' ' for char in plain_text.lower()).split()
+    if not tokens:
+        return 0.0
+    return sum(1 for token in tokens if token in words) / len(tokens)
+
+
+def letter_histogram_bytes(chunk: bytes) -> list:
+    """바이트 조각의 영문자 개수를 a~z 26칸 히스토그램으로 셈 (스트리밍 처리용)."""
+    return [chunk.count(lower) + chunk.count(upper)
+            for lower, upper in zip(_LOWER_LETTER_BYTES, _UPPER_LETTER_BYTES)]
+
+_LOWER_LETTER_BYTES = [letter.encode('ascii') for letter in string.ascii_lowercase]
+_UPPER_LETTER_BYTES = [letter.encode('ascii') for letter in string.ascii_uppercase]
+
+
+def rank_caesar_keys_from_histogram(histogram: list, sample: str, words: frozenset | None = None) -> list:
+    """
+    히스토그램과 앞부분 표본만으로 key 0~25의 순위를 매김.
+    텍스트 전체를 메모리에 올리지 않는 스트리밍 처리에서도 사용함.
+    """
+    if words is None:
+        words = COMMON_ENGLISH_WORDS
+    scores = chi_squared_scores(histogram)
+    ranking = [{'key': key, 'chi_squared': score, 'word_hit_rate': 0.0} for key, score in enumerate(scores)]
+    ranking.sort(key=lambda item: item['chi_squared'])
+
+    sample = sample[:SAMPLE_LENGTH_FOR_WORDS]
+    for item in ranking[:WORD_CHECK_CANDIDATES]:
+        item['word_hit_rate'] = word_hit_rate(caesar_cipher_decode(sample, item['key']), words)
+
+    # 단어 적중률이 높은 후보를 먼저, 같으면 chi-squared가 낮은 후보를 먼저
+    ranking[:WORD_CHECK_CANDIDATES] = sorted(
+        ranking[:WORD_CHECK_CANDIDATES], key=lambda item: (-item['word_hit_rate'], item['chi_squared'])
+    )
+    return ranking
+
+
+def rank_caesar_keys(target_text: str, words: frozenset | None = None) -> list:
+    """
+    key 0~25를 가능성이 높은 순서로 정렬하여 반환함.
+
+    chi-squared는 히스토그램 하나로 26개 key를 모두 평가하고,
+    단어 적중률은 chi-squared 상위 후보의 앞부분 표본에 대해서만 계산함.
+
+    Returns:
+        list: {'key', 'chi_squared', 'word_hit_rate'} 사전의 목록 (가장 유력한 key가 먼저)
+    """
+    return rank_caesar_keys_from_histogram(letter_histogram(target_text), target_text, words)
+
+
+def ranking_confidence(ranking: list) -> float:
+    """
+    1위 후보가 2위 후보보다 얼마나 앞서는지를 0~1 사이 값으로 나타냄.
+    단어 적중률 차이와 chi-squared 비율 중 더 확실한 쪽을 사용함.
+    """
+    if len(ranking) < 2:
+        return 1.0
+    best, second = ranking[0], ranking[1]
+    word_confidence = best['word_hit_rate'] - second['word_hit_rate']
+    if second['chi_squared'] > 0:
+        chi_confidence = 1 - best['chi_squared'] / second['chi_squared']
+    else:
+        chi_confidence = 0.0
+    return max(0.0, min(1.0, max(word_confidence, chi_confidence)))
+
+
+def select_caesar_key(target_text: str, words: frozenset | None = None) -> tuple:
+    """
+    가장 유력한 key와 그 신뢰도를 반환함.
+
+    Returns:
+        tuple: (key, 신뢰도, 전체 순위 목록)
+    """
+    ranking = rank_caesar_keys(target_text, words)
+    return ranking[0]['key'], ranking_confidence(ranking), ranking
+
+
+def prompt_key_from_user() -> int:
+    """사용자에게 0~25 사이의 key 값을 입력받음."""
     while True:
         try:
             key_input_str = input("해석된 평문을 만든 key 값: ")
             selected_key = int(key_input_str)
             if 0 <= selected_key <= 25:
-                break
+                return selected_key
             else:
                 print("오류: key 값은 0에서 25 사이여야 합니다. 다시 입력해주세요.")
         except ValueError:
             print("오류: 숫자를 입력해주세요.")
-        except Exception as e:
-            print(f"입력 중 예상치 못한 오류 발생: {e}")
 
-    final_plaintext = all_plain_text.get(selected_key)
-    if final_plaintext is not None:
-        print(f"\n선택된 Key {selected_key}로 해독된 최종 평문: '{final_plaintext}'")
-        output_filename = "result.txt"
-        try:
-            with open(output_filename, 'w', encoding='utf-8') as f:
-                f.write(final_plaintext)
-        except IOError as e:
-            print(f"오류: {output_filename} 파일에 평문 저장 중 I/O 오류 발생")
-        except Exception as e:
-            print(f"오류: 파일 저장 중 예외 발생 {e}")
+
+# --- 일괄(batch) 처리 ---
+
+STREAM_CHUNK_SIZE = 1 << 20 # 스트리밍 처리 시 한 번에 읽는 바이트 수
+PREVIEW_LENGTH = 200        # 결과 파일에 남길 평문 미리보기 길이
+
+
+def collect_batch_sources(paths: list) -> list:
+    """
+    경로 목록(파일 또는 디렉터리)에서 처리할 (파일 경로, ZIP 내부 멤버 이름 또는 None) 목록을 만듦.
+    디렉터리는 하위 폴더까지 모든 파일을 포함하고, ZIP 파일은 내부의 각 파일을 따로 처리함.
+    """
+    file_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dir_path, _, file_names in os.walk(path):
+                file_paths.extend(os.path.join(dir_path, name) for name in sorted(file_names))
+        else:
+            file_paths.append(path)
+
+    sources = []
+    for file_path in file_paths:
+        if zipfile.is_zipfile(file_path):
+            try:
+                with zipfile.ZipFile(file_path, 'r') as zf:
+                    sources.extend((file_path, info.filename) for info in zf.infolist() if not info.is_dir())
+            except (OSError, zipfile.BadZipFile):
+                sources.append((file_path, None))
+        else:
+            sources.append((file_path, None))
+    return sources
+
+
+@contextlib.contextmanager
+def _open_source(file_path: str, member_name: str | None, zip_password: bytes | None):
+    """원본 파일 또는 ZIP 내부 멤버를 바이너리 스트림으로 엶."""
+    if member_name is None:
+        with open(file_path, 'rb') as stream:
+            yield stream
+    else:
+        with zipfile.ZipFile(file_path, 'r') as zf, zf.open(member_name, pwd=zip_password) as stream:
+            yield stream
+
+
+def _iter_chunks(stream, chunk_size: int):
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def plaintext_filename(file_path: str, member_name: str | None = None) -> str:
+    """
+    평문 파일 이름을 만듦. 다른 디렉터리에 같은 이름의 파일이 있어도 겹치지 않도록
+    원본의 절대 경로(와 ZIP 멤버 이름)로 만든 짧은 해시를 붙임.
+
+    Returns:
+        str: '<파일 이름>[__<멤버>].<해시 8자리>.plain.txt'
+    """
+    output_name = os.path.basename(file_path)
+    source_id = os.path.abspath(file_path)
+    if member_name is not None:
+        output_name += '__' + member_name.replace('/', '_')
+        source_id += '\0' + member_name
+    digest = hashlib.sha1(source_id.encode('utf-8')).hexdigest()[:8]
+    return f'{output_name}.{digest}.plain.txt'
+
+
+def decode_source(task: tuple) -> dict:
+    """
+    암호문 하나를 두 번 스트리밍하여 복호화함 (프로세스 풀의 작업 단위).
+
+    1) 조각마다 히스토그램을 누적하고 앞부분 표본만 보관하여 key를 선택
+    2) plaintext_dir가 있으면 선택한 key로 조각 단위 복호화하여 파일로 저장
+    메모리 사용량은 조각 크기(STREAM_CHUNK_SIZE)로 제한됨.
+    """
+    file_path, member_name, zip_password, plaintext_dir, min_confidence = task
+    result = {
+        'source': file_path,
+        'member': member_name,
+        'key': None,
+        'confidence': None,
+        'needs_review': None,
+        'bytes': 0,
+        'preview': None,
+        'plaintext_file': None,
+        'error': None,
+    }
+    try:
+        histogram = [0] * 26
+        sample_bytes = b''
+        with _open_source(file_path, member_name, zip_password) as stream:
+            for chunk in _iter_chunks(stream, STREAM_CHUNK_SIZE):
+                result['bytes'] += len(chunk)
+                for i, count in enumerate(letter_histogram_bytes(chunk)):
+                    histogram[i] += count
+                if len(sample_bytes) < SAMPLE_LENGTH_FOR_WORDS:
+                    sample_bytes += chunk[:SAMPLE_LENGTH_FOR_WORDS - len(sample_bytes)]
+
+        sample = sample_bytes.decode('utf-8', errors='ignore')
+        ranking = rank_caesar_keys_from_histogram(histogram, sample)
+        key = ranking[0]['key']
+        confidence = ranking_confidence(ranking)
+        result['key'] = key
+        result['confidence'] = round(confidence, 4)
+        result['needs_review'] = confidence < min_confidence
+        result['preview'] = caesar_cipher_decode(sample[:PREVIEW_LENGTH], key)
+
+        if plaintext_dir:
+            output_path = os.path.join(plaintext_dir, plaintext_filename(file_path, member_name))
+            with _open_source(file_path, member_name, zip_password) as stream, open(output_path, 'wb') as out:
+                for chunk in _iter_chunks(stream, STREAM_CHUNK_SIZE):
+                    out.write(caesar_cipher_decode_bytes(chunk, key))
+            result['plaintext_file'] = output_path
+    except (OSError, RuntimeError, zipfile.BadZipFile, zipfile.zlib.error, KeyError) as e:
+        result['error'] = f'{type(e).__name__}: {e}'
+    return result
+
+
+def run_batch(paths: list, output_filename: str, zip_password: str | None = None,
+              plaintext_dir: str | None = None, processes: int | None = None,
+              min_confidence: float = DEFAULT_MIN_CONFIDENCE) -> int:
+    """
+    여러 ZIP/텍스트 파일의 암호문을 프로세스 풀로 나누어 자동 복호화하고,
+    결과를 하나의 JSONL 또는 CSV 파일(확장자로 구분)에 기록함.
+
+    Returns:
+        int: 처리한 암호문 수
+    """
+    sources = collect_batch_sources(paths)
+    if not sources:
+        print("처리할 파일이 없습니다.")
+        return 0
+    if plaintext_dir:
+        os.makedirs(plaintext_dir, exist_ok=True)
+
+    password_bytes = zip_password.encode('utf-8') if zip_password else None
+    tasks = [(file_path, member_name, password_bytes, plaintext_dir, min_confidence)
+             for file_path, member_name in sources]
+    fieldnames = ['source', 'member', 'key', 'confidence', 'needs_review', 'bytes',
+                  'preview', 'plaintext_file', 'error']
+    use_csv = output_filename.lower().endswith('.csv')
+    print(f"{len(tasks)}개의 암호문을 처리합니다 -> {output_filename}")
+
+    processed = 0
+    with open(output_filename, 'w', newline='', encoding='utf-8') as out, \
+            multiprocessing.Pool(processes) as pool:
+        if use_csv:
+            writer = csv.DictWriter(out, fieldnames=fieldnames)
+            writer.writeheader()
+        for result in pool.imap_unordered(decode_source, tasks):
+            # 결과는 도착하는 대로 바로 기록하여 메모리에 쌓아 두지 않음
+            if use_csv:
+                writer.writerow(result)
+            else:
+                out.write(json.dumps(result, ensure_ascii=False) + '\n')
+            processed += 1
+            if result['error']:
+                print(f"오류: {result['source']} {result['member'] or ''} - {result['error']}")
+    print(f"처리 완료: {processed}개")
+    return processed
+
+
+# --- main ---
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='카이사르 암호 해독')
+    parser.add_argument('--batch', nargs='+', metavar='PATH',
+                        help='일괄 처리할 ZIP/텍스트 파일 또는 디렉터리 (지정하지 않으면 Week_10 ZIP 하나를 대화형으로 처리)')
+    parser.add_argument('--output', default='results.jsonl', help='일괄 처리 결과 파일 (.jsonl 또는 .csv)')
+    parser.add_argument('--zip-password', help='일괄 처리할 ZIP 파일의 암호')
+    parser.add_argument('--plaintext-dir', help='복호화한 평문을 저장할 디렉터리')
+    parser.add_argument('--processes', type=int, default=None, help='프로세스 수 (기본값: CPU 코어 수)')
+    args = parser.parse_args()
+
+    if args.batch:
+        run_batch(args.batch, args.output, args.zip_password, args.plaintext_dir, args.processes)
     else:
-        print(f"오류: 선택된 key에 해당되는 해독된 텍스트 찾을 수 없음")
-else:
-    print("암호문을 가져오는 데 실패했습니다.")
+        target_text = load_caesar_target_from_zip()
+
+        if target_text:
+            print("#" * 30)
+            print(f"Ciphertext: {target_text}")
+            all_plain_text = caesar_decode_all(target_text)
+            for key, plain_text in all_plain_text.items():
+                print(f"        Key = {key:02d}--> Plaintext: {plain_text}")
+
+            # 문자 빈도와 사전 단어로 key를 자동 선택하고, 신뢰도가 낮을 때만 사용자에게 물어봄
+            selected_key, confidence, _ = select_caesar_key(target_text)
+            print(f"\n자동 선택된 key: {selected_key} (신뢰도 {confidence:.2f})")
+            if confidence < DEFAULT_MIN_CONFIDENCE:
+                print("신뢰도가 낮아 직접 key를 선택해야 합니다.")
+                selected_key = prompt_key_from_user()
+
+            final_plaintext = all_plain_text.get(selected_key)
+            print(f"\n선택된 Key {selected_key}로 해독된 최종 평문: '{final_plaintext}'")
+            output_filename = "result.txt"
+            try:
+                with open(output_filename, 'w', encoding='utf-8') as f:
+                    f.write(final_plaintext)
+            except IOError as e:
+                print(f"오류: {output_filename} 파일에 평문 저장 중 I/O 오류 발생")
+            except Exception as e:
+                print(f"오류: 파일 저장 중 예외 발생 {e}")
+        else:
+            print("암호문을 가져오는 데 실패했습니다.")